@@ -0,0 +1,119 @@
+"""
+Wall time of tests which each make a round trip to a local TCP echo server,
+with a connection opened for every test versus leased from a
+`cooperative_pool`.
+
+The server waits `--handshake-ms` before greeting each new connection, a
+stand-in for the handshake of a real database or service.
+
+    python benchmarks/connection_pool.py --tests 2000 --pool-size 20
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+    import pytest
+
+    from pytest_asyncio_cooperative import cooperative_pool
+
+
+    async def handle(reader, writer):
+        await asyncio.sleep({handshake})
+        writer.write(b"ready\\n")
+        while line := await reader.readline():
+            writer.write(line)
+            await writer.drain()
+        writer.close()
+
+
+    @pytest.fixture(scope="session")
+    async def echo_server():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        yield server.sockets[0].getsockname()[:2]
+        server.close()
+        await server.wait_closed()
+
+
+    async def connect(address):
+        reader, writer = await asyncio.open_connection(*address)
+        await reader.readline()
+        return reader, writer
+
+
+    {fixture}
+    async def connection(echo_server):
+        reader, writer = await connect(echo_server)
+        yield reader, writer
+        writer.close()
+        await writer.wait_closed()
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_echo(x, connection):
+        reader, writer = connection
+        writer.write(b"ping\\n")
+        assert await reader.readline() == b"ping\\n"
+    """
+)
+
+FIXTURES = {
+    "per-test": "@pytest.fixture",
+    "pooled": "@cooperative_pool(size={pool_size})",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=5)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+
+        for name, fixture in FIXTURES.items():
+            path.write_text(
+                TEST_MODULE.format(
+                    fixture=fixture.format(pool_size=args.pool_size),
+                    handshake=args.handshake_ms / 1000,
+                    tests=args.tests,
+                )
+            )
+
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pytest",
+                    "-q",
+                    "-p",
+                    "no:cacheprovider",
+                    f"--max-asyncio-tasks={args.max_asyncio_tasks}",
+                    str(path),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=tmp,
+                check=True,
+            )
+            duration = time.perf_counter() - start
+            print(f"{name:>9}: {args.tests} tests in {duration:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Time spent setting up fixtures per item of a heavily parametrized test, with
+the resolution plan shared between items versus worked out again for every
+item.
+
+Tests are run one at a time so the time awaiting each item's fixtures isn't
+spent running other tests.
+
+    python benchmarks/fixture_setup.py --tests 10000
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from pytest_asyncio_cooperative import fixtures
+from pytest_asyncio_cooperative import plugin
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import pytest
+
+
+    @pytest.fixture(scope="module")
+    def config():
+        return {{}}
+
+
+    @pytest.fixture
+    def base(config):
+        return 1
+
+
+    @pytest.fixture
+    async def left(base, config):
+        return base
+
+
+    @pytest.fixture
+    def right(base):
+        yield base
+
+
+    @pytest.fixture(autouse=True)
+    def autouse():
+        pass
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_a(x, left, right, base):
+        pass
+    """
+)
+
+
+class TimeFixtureSetup:
+    def __init__(self, cached: bool):
+        self.cached = cached
+        self.items = 0
+        self.total = 0.0
+
+    def pytest_configure(self, config):
+        fill_fixtures = fixtures.fill_fixtures
+
+        async def timed_fill_fixtures(item):
+            if not self.cached:
+                config.stash[fixtures.resolution_plans_key] = {}
+
+            start = time.perf_counter()
+            try:
+                return await fill_fixtures(item)
+            finally:
+                self.total += time.perf_counter() - start
+                self.items += 1
+
+        plugin.fill_fixtures = timed_fill_fixtures
+
+    def pytest_unconfigure(self):
+        plugin.fill_fixtures = fixtures.fill_fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+        path.write_text(TEST_MODULE.format(tests=args.tests))
+
+        for cached in [False, True]:
+            timer = TimeFixtureSetup(cached)
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    pytest.main(
+                        [
+                            "-q",
+                            "-p",
+                            "no:cacheprovider",
+                            "--max-asyncio-tasks=1",
+                            "--rootdir",
+                            tmp,
+                            str(path),
+                        ],
+                        plugins=[timer],
+                    )
+                finally:
+                    sys.stdout = stdout
+
+            name = "cached" if cached else "uncached"
+            per_item = timer.total / timer.items * 1e6
+            print(f"{name:>8}: {per_item:.1f} us per item ({timer.items} items)")
+
+
+if __name__ == "__main__":
+    main()
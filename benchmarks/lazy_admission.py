@@ -0,0 +1,91 @@
+"""
+Peak memory of a large generated suite with the legacy scheduler, which
+creates every coroutine up front, and the queue scheduler, which creates them
+on admission.
+
+    python benchmarks/lazy_admission.py --tests 50000
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+    import pytest
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_a(x):
+        await asyncio.sleep(0)
+    """
+)
+
+
+def child(scheduler, path, max_tasks):
+    import pytest
+
+    pytest.main(
+        [
+            "-q",
+            "-p",
+            "no:cacheprovider",
+            f"--asyncio-scheduler={scheduler}",
+            f"--max-asyncio-tasks={max_tasks}",
+            path,
+        ]
+    )
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"PEAK_RSS_KIB={peak_kib}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=20000)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=100)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.max_asyncio_tasks)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+        path.write_text(TEST_MODULE.format(tests=args.tests))
+
+        for scheduler in ["legacy", "queue"]:
+            start = time.perf_counter()
+            out = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    f"--max-asyncio-tasks={args.max_asyncio_tasks}",
+                    "--child",
+                    scheduler,
+                    str(path),
+                ],
+                capture_output=True,
+                text=True,
+                cwd=tmp,
+            ).stdout
+            duration = time.perf_counter() - start
+            peak_kib = int(out.rsplit("PEAK_RSS_KIB=", 1)[1])
+            print(
+                f"{scheduler:>8}: {args.tests} tests, "
+                f"peak RSS {peak_kib / 1024:.1f} MiB, {duration:.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Wall time of tests contending for a shared resource when they all take the
+same `Lock` versus an `RWLock` (where only `--write-percent` of them write),
+and versus a `KeyedLock` (where each test locks one of `--keys` keys).
+
+Every test holds its lock for `--hold-ms`.
+
+    python benchmarks/lock_contention.py --tests 500 --write-percent 10 --keys 10
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+    import pytest
+
+    from pytest_asyncio_cooperative import KeyedLock
+    from pytest_asyncio_cooperative import Lock
+    from pytest_asyncio_cooperative import RWLock
+
+    lock = Lock()
+    rwlock = RWLock()
+    keyed_lock = KeyedLock()
+
+    LOCKS = {{
+        "Lock": lambda x: lock(),
+        "RWLock": lambda x: rwlock.write() if x % 100 < {write_percent} else rwlock.read(),
+        "KeyedLock": lambda x: keyed_lock(x % {keys}),
+    }}
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_a(x):
+        async with LOCKS["{lock}"](x):
+            await asyncio.sleep({hold})
+    """
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=500)
+    parser.add_argument("--hold-ms", type=float, default=5)
+    parser.add_argument("--write-percent", type=int, default=10)
+    parser.add_argument("--keys", type=int, default=10)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+
+        for lock in ["Lock", "RWLock", "KeyedLock"]:
+            path.write_text(
+                TEST_MODULE.format(
+                    lock=lock,
+                    tests=args.tests,
+                    hold=args.hold_ms / 1000,
+                    write_percent=args.write_percent,
+                    keys=args.keys,
+                )
+            )
+
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pytest",
+                    "-q",
+                    "-p",
+                    "no:cacheprovider",
+                    f"--max-asyncio-tasks={args.max_asyncio_tasks}",
+                    str(path),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=tmp,
+                check=True,
+            )
+            duration = time.perf_counter() - start
+            print(f"{lock:>9}: {args.tests} tests in {duration:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Wall time of a suite of tests which do little but switch between tasks, run on
+different event loop implementations with --asyncio-loop-factory:
+
+- asyncio: the default loop with asyncio's C accelerated Task
+- pure-python: the default loop with asyncio's pure Python Task and Future, a
+  stand-in for the overhead of a loop without C accelerated tasks
+- uvloop: if it is installed
+
+    python benchmarks/loop_backends.py --tests 2000
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+    import pytest
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_a(x):
+        for _ in range({switches}):
+            await asyncio.sleep(0)
+    """
+)
+
+LOOPS_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+
+    def pure_python():
+        loop = asyncio.new_event_loop()
+        loop.set_task_factory(
+            lambda loop, coro, **kwargs: asyncio.tasks._PyTask(
+                coro, loop=loop, **kwargs
+            )
+        )
+        return loop
+    """
+)
+
+LOOP_FACTORIES = {
+    "asyncio": "asyncio.new_event_loop",
+    "pure-python": "benchmark_loops:pure_python",
+    "uvloop": "uvloop.new_event_loop",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument("--switches", type=int, default=1000)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+        path.write_text(TEST_MODULE.format(tests=args.tests, switches=args.switches))
+        (Path(tmp) / "benchmark_loops.py").write_text(LOOPS_MODULE)
+        pythonpath = os.pathsep.join(filter(None, [tmp, os.environ.get("PYTHONPATH")]))
+        env = {**os.environ, "PYTHONPATH": pythonpath}
+
+        for name, factory in LOOP_FACTORIES.items():
+            if name == "uvloop" and importlib.util.find_spec("uvloop") is None:
+                print(f"{name:>12}: not installed")
+                continue
+
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pytest",
+                    "-q",
+                    "-p",
+                    "no:cacheprovider",
+                    f"--asyncio-loop-factory={factory}",
+                    f"--max-asyncio-tasks={args.max_asyncio_tasks}",
+                    str(path),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=tmp,
+                env=env,
+                check=True,
+            )
+            duration = time.perf_counter() - start
+            print(f"{name:>12}: {args.tests} tests in {duration:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
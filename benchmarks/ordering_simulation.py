@@ -0,0 +1,74 @@
+"""
+Simulated total wall time (makespan) of admitting tests in collection order
+versus longest-first order, for synthetic test duration distributions.
+
+Each test holds one of `--max-asyncio-tasks` slots for its duration and the
+next test is admitted as soon as a slot is free, like the queue scheduler.
+The lower bound is the larger of the longest test and the total duration
+divided between the slots.
+
+    python benchmarks/ordering_simulation.py --tests 2000 --max-asyncio-tasks 50
+"""
+
+import argparse
+import heapq
+import random
+
+from pytest_asyncio_cooperative.ordering import collection_order
+from pytest_asyncio_cooperative.ordering import longest_first
+
+# Orders which only depend on durations
+ORDERS = {"collection": collection_order, "longest-first": longest_first}
+
+
+class Item:
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+
+
+class KnownDurations:
+    def __init__(self, durations):
+        self.durations = durations
+
+    def estimate(self, items):
+        return [self.durations[item.nodeid] for item in items]
+
+
+def makespan(durations, max_tasks: int) -> float:
+    slots = [0.0] * min(max_tasks, len(durations))
+    for duration in durations:
+        heapq.heapreplace(slots, slots[0] + duration)
+    return max(slots)
+
+
+def distributions(rng, tests: int):
+    yield "uniform 0-10s", [rng.uniform(0, 10) for _ in range(tests)]
+    yield "exponential mean 2s", [rng.expovariate(0.5) for _ in range(tests)]
+    yield "pareto (long tail)", [rng.paretovariate(1.5) for _ in range(tests)]
+    yield "1s, one 60s test last", [1.0] * (tests - 1) + [60.0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'distribution':>24} {'bound':>9}", *(f"{o:>14}" for o in ORDERS))
+    for name, durations in distributions(rng, args.tests):
+        items = [Item(str(i)) for i in range(len(durations))]
+        known = KnownDurations({item.nodeid: d for item, d in zip(items, durations)})
+
+        bound = max(max(durations), sum(durations) / args.max_asyncio_tasks)
+        makespans = []
+        for order in ORDERS.values():
+            ordered = known.estimate(order(items, known))
+            makespans.append(makespan(ordered, args.max_asyncio_tasks))
+
+        print(f"{name:>24} {bound:>8.1f}s", *(f"{m:>13.1f}s" for m in makespans))
+
+
+if __name__ == "__main__":
+    main()
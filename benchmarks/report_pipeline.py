@@ -0,0 +1,68 @@
+"""
+Wall time of a suite of fast tests when finished tests are reported inline on
+the event loop versus on the reporter thread.
+
+    python benchmarks/report_pipeline.py --tests 5000
+
+Requires pytest-asyncio-cooperative to be installed (eg. `pip install .`).
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+
+TEST_MODULE = textwrap.dedent(
+    """
+    import asyncio
+
+    import pytest
+
+
+    @pytest.mark.parametrize("x", range({tests}))
+    @pytest.mark.asyncio_cooperative
+    async def test_a(x):
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+    """
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=5000)
+    parser.add_argument("--max-asyncio-tasks", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test_generated.py"
+        path.write_text(TEST_MODULE.format(tests=args.tests))
+
+        for reporter in ["inline", "thread"]:
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pytest",
+                    "-q",
+                    "-p",
+                    "no:cacheprovider",
+                    f"--asyncio-reporter={reporter}",
+                    f"--max-asyncio-tasks={args.max_asyncio_tasks}",
+                    str(path),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=tmp,
+                check=True,
+            )
+            duration = time.perf_counter() - start
+            print(f"{reporter:>8}: {args.tests} tests in {duration:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
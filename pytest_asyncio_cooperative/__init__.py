@@ -1,4 +1,7 @@
 import asyncio
+import collections
+
+from .pool import cooperative_pool
 
 
 class Lock:
@@ -8,3 +11,122 @@ class Lock:
         except AttributeError:
             self.lock = asyncio.Lock()
             return self.lock
+
+
+class _Held:
+    """Async context manager which holds a lock between `acquire` and
+    `release`"""
+
+    def __init__(self, acquire, release):
+        self.acquire = acquire
+        self.release = release
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class RWLock:
+    """Lets any number of readers, or a single writer, hold the lock.
+
+    Waiters are admitted in the order they arrived, with consecutive readers
+    admitted together, so neither readers nor writers are starved. Its state
+    is created on first use, and again if used from another event loop.
+
+        async with rwlock.read():
+            ...
+
+        async with rwlock.write():
+            ...
+    """
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        if getattr(self, "_loop", None) is not loop:
+            self._loop = loop
+            self._readers = 0
+            self._writing = False
+            self._waiters = collections.deque()
+        return loop
+
+    def read(self):
+        return _Held(self._acquire_read, self._release_read)
+
+    def write(self):
+        return _Held(self._acquire_write, self._release_write)
+
+    async def _acquire_read(self):
+        loop = self._state()
+        if not self._writing and not self._waiters:
+            self._readers += 1
+            return
+        await self._wait(loop, False)
+
+    async def _acquire_write(self):
+        loop = self._state()
+        if not self._writing and not self._readers and not self._waiters:
+            self._writing = True
+            return
+        await self._wait(loop, True)
+
+    async def _wait(self, loop, writer: bool):
+        waiter = loop.create_future()
+        self._waiters.append((waiter, writer))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                # Waiters behind this one may be able to go now
+                self._wake()
+            elif writer:
+                self._release_write()
+            else:
+                self._release_read()
+            raise
+
+    def _release_read(self):
+        self._readers -= 1
+        self._wake()
+
+    def _release_write(self):
+        self._writing = False
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and not self._writing:
+            waiter, writer = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+            elif writer:
+                if self._readers:
+                    return
+                self._writing = True
+                self._waiters.popleft()
+                waiter.set_result(None)
+            else:
+                self._readers += 1
+                self._waiters.popleft()
+                waiter.set_result(None)
+
+
+class KeyedLock:
+    """A separate lock for each key, eg. per table or per mocked module, so
+    only tests using the same key exclude each other. Locks are created on
+    first use, and again if used from another event loop.
+
+        async with keyed_lock("users"):
+            ...
+    """
+
+    def __call__(self, key):
+        loop = asyncio.get_running_loop()
+        if getattr(self, "_loop", None) is not loop:
+            self._loop = loop
+            self._locks = {}
+        try:
+            return self._locks[key]
+        except KeyError:
+            self._locks[key] = asyncio.Lock()
+            return self._locks[key]
@@ -0,0 +1,95 @@
+import json
+import statistics
+import time
+
+
+class AdaptiveConcurrency:
+    """Picks how many tests run at once for --max-asyncio-tasks=auto.
+
+    Completed tests are observed in windows of at least `limit` tests, so each
+    window covers about one round of admissions. After a window the limit is
+    raised while the window's median latency, from admission to completion,
+    stays within `latency_tolerance` of the baseline and its error rate stays
+    within `error_tolerance` of the lowest seen. Otherwise the limit is cut by
+    `decrease` (AIMD). Until the first cut the limit doubles, afterwards it
+    grows by one.
+
+    The baseline follows the lowest median latency straight away and drifts
+    up slowly, so a suite whose later tests are slower doesn't back off for
+    good."""
+
+    initial_limit = 8
+    min_limit = 1
+    max_limit = 1000
+    min_window = 5
+    latency_tolerance = 1.5
+    error_tolerance = 0.1
+    decrease = 0.75
+    drift = 0.02
+
+    def __init__(self, log_path=None):
+        self.log_path = log_path
+        self.limit = self.initial_limit
+        self.slow_start = True
+        self.baseline = None
+        self.lowest_error_rate = None
+        self.latencies = []
+        self.errors = 0
+        self.start = time.perf_counter()
+        self.log = []
+
+    def observe(self, latency: float, failed: bool) -> int:
+        """Record a completed test and return the limit to use from now on"""
+        self.latencies.append(latency)
+        self.errors += failed
+        if len(self.latencies) >= max(self.limit, self.min_window):
+            self._adjust()
+        return self.limit
+
+    def _adjust(self):
+        latency = statistics.median(self.latencies)
+        error_rate = self.errors / len(self.latencies)
+        window = len(self.latencies)
+        self.latencies = []
+        self.errors = 0
+
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        if self.lowest_error_rate is None or error_rate < self.lowest_error_rate:
+            self.lowest_error_rate = error_rate
+
+        if error_rate > self.lowest_error_rate + self.error_tolerance:
+            action = "decrease (errors)"
+        elif latency > self.baseline * self.latency_tolerance:
+            action = "decrease (latency)"
+        else:
+            action = "increase"
+
+        if action == "increase":
+            limit = self.limit * 2 if self.slow_start else self.limit + 1
+        else:
+            self.slow_start = False
+            limit = int(self.limit * self.decrease)
+        limit = max(self.min_limit, min(self.max_limit, limit))
+
+        self.log.append(
+            {
+                "time": time.perf_counter() - self.start,
+                "tests": window,
+                "limit": self.limit,
+                "median_latency": latency,
+                "baseline_latency": self.baseline,
+                "error_rate": error_rate,
+                "action": action,
+                "new_limit": limit,
+            }
+        )
+        self.limit = limit
+        self.baseline += (latency - self.baseline) * self.drift
+
+    def write_log(self):
+        if not self.log_path:
+            return
+
+        with open(self.log_path, "w") as f:
+            json.dump(self.log, f, indent=2)
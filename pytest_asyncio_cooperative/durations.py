@@ -0,0 +1,37 @@
+DURATIONS_CACHE_KEY = "asyncio-cooperative/durations"
+
+COOPERATIVE_MARKERS = ("asyncio_cooperative", "cooperative_thread")
+
+
+class Durations:
+    """Durations of cooperative tests, persisted across runs in pytest's cache
+    and keyed by nodeid. Registered as a plugin to record the durations."""
+
+    def __init__(self, config):
+        self.config = config
+        self.recorded = {}
+
+        cache = getattr(config, "cache", None)
+        self.previous = cache.get(DURATIONS_CACHE_KEY, {}) if cache else {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        if any(marker in report.keywords for marker in COOPERATIVE_MARKERS):
+            self.recorded[report.nodeid] = report.duration
+
+    def pytest_sessionfinish(self):
+        # The pytest-xdist controller receives every report and saves them
+        if hasattr(self.config, "workerinput"):
+            return
+
+        cache = getattr(self.config, "cache", None)
+        if cache and self.recorded:
+            cache.set(DURATIONS_CACHE_KEY, {**self.previous, **self.recorded})
+
+    def estimate(self, items):
+        """Expected duration of each item from previous runs. Items which have
+        never been run are expected to take the mean of the known durations."""
+        known = [self.previous[i.nodeid] for i in items if i.nodeid in self.previous]
+        default = sum(known) / len(known) if known else 1.0
+        return [self.previous.get(i.nodeid, default) for i in items]
@@ -0,0 +1,54 @@
+class FixtureDurations:
+    """Registered as a plugin to report how long each fixture of the
+    cooperative tests took to set up and tear down"""
+
+    # Shorter durations are only shown with -vv, like pytest's --durations
+    min_duration = 0.005
+
+    def __init__(self, config):
+        count = config.getoption("--asyncio-fixture-durations") or config.getini(
+            "asyncio_fixture_durations"
+        )
+        self.enabled = count is not None and count != ""
+        self.count = int(count) if self.enabled else 0
+        self.verbose = config.option.verbose
+        self.durations = []
+
+    @staticmethod
+    def user_properties(fixture_durations):
+        """Properties for each fixture's durations, eg. for JUnit XML"""
+        return [
+            (f"asyncio_fixture_{phase}:{name}", duration)
+            for name, phases in fixture_durations.items()
+            for phase, duration in phases.items()
+        ]
+
+    def pytest_runtest_logreport(self, report):
+        fixture_durations = getattr(report, "asyncio_fixture_durations", None)
+        if fixture_durations is None:
+            return
+        for name, phases in fixture_durations.items():
+            for phase, duration in phases.items():
+                self.durations.append((duration, phase, f"{report.nodeid}::{name}"))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.enabled:
+            return
+
+        slowest = sorted(self.durations, reverse=True)
+        if self.count > 0:
+            terminalreporter.write_sep(
+                "=", f"slowest {self.count} asyncio fixture durations"
+            )
+            slowest = slowest[: self.count]
+        else:
+            terminalreporter.write_sep("=", "slowest asyncio fixture durations")
+
+        for i, (duration, phase, name) in enumerate(slowest):
+            if self.verbose < 2 and duration < self.min_duration:
+                terminalreporter.write_line(
+                    f"\n({len(slowest) - i} durations < {self.min_duration}s hidden.  "
+                    "Use -vv to show these durations.)"
+                )
+                break
+            terminalreporter.write_line(f"{duration:.2f}s {phase:<8} {name}")
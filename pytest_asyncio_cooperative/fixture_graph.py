@@ -0,0 +1,34 @@
+import json
+
+
+class FixtureGraphs:
+    """Registered as a plugin to write the graph of fixtures each cooperative
+    test was set up with, and how long each fixture took to set up, to a JSON
+    file for debugging"""
+
+    def __init__(self, config):
+        self.path = config.getoption("--asyncio-fixture-graph") or config.getini(
+            "asyncio_fixture_graph"
+        )
+        self.rootpath = config.rootpath
+        self.graphs = {}
+
+    def graph(self, item):
+        """The item's fixture graph with setup times relative to the start of
+        the item's setup"""
+        return {
+            name: {**node, "start": node["start"] - item.start_setup}
+            for name, node in item.fixture_graph.items()
+        }
+
+    def pytest_runtest_logreport(self, report):
+        graph = getattr(report, "asyncio_fixture_graph", None)
+        if graph is not None:
+            self.graphs[report.nodeid] = graph
+
+    def pytest_sessionfinish(self, session):
+        if not self.path or hasattr(session.config, "workerinput"):
+            return
+
+        with open(self.rootpath / self.path, "w") as f:
+            json.dump(self.graphs, f, indent=2)
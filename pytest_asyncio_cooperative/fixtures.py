@@ -1,20 +1,51 @@
 import asyncio
+import collections.abc
 import inspect
+import sys
+import time
+import traceback
 import types
+from typing import Any
+from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
 
+import pytest
 from _pytest.fixtures import FixtureDef
-from _pytest.fixtures import FixtureRequest
-from _pytest.fixtures import FuncFixtureInfo
 from _pytest.fixtures import resolve_fixture_function
 from _pytest.nodes import Item
 
+from .pool import Pool
+
 
 class Ignore(Exception):
     pass
 
 
+# Stands in for the request in resolution plans since it's different for every item
+REQUEST = "request"
+
+TEARDOWN_MODES = ["concurrent", "sequential"]
+
+teardown_mode_key = pytest.StashKey[str]()
+
+
+class TeardownErrors(Exception):
+    """More than one fixture failed to tear down"""
+
+    def __init__(self, errors: Dict[str, BaseException]):
+        self.errors = errors
+        tracebacks = [
+            f"Fixture '{name}':\n"
+            + "".join(traceback.format_exception(type(e), e, e.__traceback__))
+            for name, e in errors.items()
+        ]
+        super().__init__(
+            f"{len(errors)} fixtures failed to tear down\n\n" + "\n".join(tracebacks)
+        )
+
+
 def function_args(func):
     return func.__code__.co_varnames[: func.__code__.co_argcount]
 
@@ -45,69 +76,320 @@ def _get_fixture(item, arg_name, fixture=None):
     return fixtures[-1]
 
 
-async def fill_fixtures(item: Item):
-    fixture_values = []
-    teardowns = []
-
-    # Important to maintain order of fixtures specified by function
-    fixture_names: List[str] = list(function_args(item.function))
-
-    # Add fixtures not specified in function arguments (eg. autouse)
-    for fixture_name in item._fixtureinfo.initialnames:
-        if fixture_name not in fixture_names:
-            fixture_names.append(fixture_name)
-
+def shared_fixtures(item: Item) -> List[FixtureDef]:
+    """Module and session scoped fixtures used by the item, in the order of
+    its fixture closure"""
     fixtures = []
-    are_autouse = []
-    for fixture_name in fixture_names:
+    for name in item._fixtureinfo.names_closure:
+        if name not in item._fixtureinfo.name2fixturedefs:
+            continue
         try:
-            fixture = _get_fixture(item, fixture_name)
+            fixture = _get_fixture(item, name)
         except Ignore:
             continue
+        if getattr(fixture, "scope", "function") != "function":
+            if fixture not in fixtures:
+                fixtures.append(fixture)
+    return fixtures
 
-        is_autouse = fixture_name not in function_args(item.function)
 
-        if fixture.scope not in ["function", "module", "session"]:
-            raise Exception(f"{fixture.scope} scope not supported")
+async def fill_fixtures(item: Item):
+    """Set up the item's fixtures. Returns their values and a coroutine function
+    which tears them down."""
+    fixture_values = []
+    item.__dict__.pop("_asyncio_setup_error", None)
 
-        fixtures.append(fixture)
-        are_autouse.append(is_autouse)
+    plan = get_resolution_plan(item)
 
     # Fill fixtures concurrently
-    fill_results = await asyncio.gather(
-        *(
-            fill_fixture_fixtures(item._fixtureinfo, fixture, item)
-            for fixture in fixtures
-        )
-    )
-
-    for (value, extra_teardowns), is_autouse in zip(fill_results, are_autouse):
-        teardowns.extend(extra_teardowns)
-
-        if not is_autouse:
-            fixture_values.append(value)
+    resolver = FixtureResolver(item, plan)
+    resolver.start([fixture for fixture, _ in plan.fixtures])
+
+    try:
+        for fixture, is_autouse in plan.fixtures:
+            value = await resolver.value(fixture)
+            if not is_autouse:
+                fixture_values.append(value)
+    except BaseException as e:
+        # Tear down the fixtures which were set up, eg. to give back leases of
+        # pooled fixtures
+        await resolver.abandon()
+
+        # Reported as the item's setup error, instead of the regular fixture
+        # logic setting up the fixtures again to find it
+        if isinstance(e, Exception):
+            item._asyncio_setup_error = e
+        item.fixturenames = []
+        raise
+
+    item.fixture_graph = resolver.graph
+    item.fixture_durations = resolver.durations
 
     # Slight hack to stop the regular fixture logic from running
     item.fixturenames = []
 
-    return fixture_values, teardowns
+    return fixture_values, resolver.teardown
 
 
-async def _fill_fixture_fixtures(
-    _fixtureinfo: FuncFixtureInfo, fixture: FixtureDef, item: Item
-):
-    values = []
-    all_teardowns = []
-    for arg_name in function_args(fixture.func):
+class ResolutionPlan:
+    """The fixtures a test function uses, what each of them depends on and how
+    to set them up. Worked out once and shared by every item with the same
+    function and fixture closure (eg. the items of a parametrized test)."""
+
+    def __init__(self, item: Item):
+        # Top level fixtures and whether they're autouse
+        self.fixtures = []
+        self.dependencies = {}
+        self.setups = {}
+
+        # Important to maintain order of fixtures specified by function
+        args = function_args(item.function)
+        fixture_names: List[str] = list(args)
+
+        # Add fixtures not specified in function arguments (eg. autouse)
+        for fixture_name in item._fixtureinfo.initialnames:
+            if fixture_name not in fixture_names:
+                fixture_names.append(fixture_name)
+
+        for fixture_name in fixture_names:
+            try:
+                fixture = self._get_fixture(item, fixture_name)
+            except Ignore:
+                continue
+
+            if fixture is not REQUEST:
+                if fixture.scope not in ["function", "module", "session"]:
+                    raise Exception(f"{fixture.scope} scope not supported")
+                self._add(item, fixture)
+
+            self.fixtures.append((fixture, fixture_name not in args))
+
+    @staticmethod
+    def _get_fixture(item: Item, arg_name: str):
+        # The request is different for every item
+        if arg_name == "request":
+            return REQUEST
+        return _get_fixture(item, arg_name)
+
+    def _add(self, item: Item, fixture: FixtureDef):
+        if fixture in self.dependencies:
+            return
+
+        func = resolve_fixture_function(fixture, item._request)
+        dependencies = []
+        for arg_name in function_args(func):
+            try:
+                dependency = self._get_fixture(item, arg_name)
+            except Ignore:
+                continue
+            if dependency is fixture:
+                raise Exception(
+                    f"Fixture '{fixture.argname}' depends on a fixture with the same "
+                    f"name, this is not supported"
+                )
+            dependencies.append(dependency)
+
+        self.dependencies[fixture] = dependencies
+        self.setups[fixture] = setup_function(func)
+        for dependency in dependencies:
+            if dependency is not REQUEST:
+                self._add(item, dependency)
+
+
+resolution_plans_key = pytest.StashKey[
+    Dict[Tuple[Any, int], Tuple[Any, ResolutionPlan]]
+]()
+
+
+def get_resolution_plan(item: Item) -> ResolutionPlan:
+    plans = item.config.stash.setdefault(resolution_plans_key, {})
+
+    # Parametrized items share their definition's fixture info
+    key = (item.function, id(item._fixtureinfo))
+    try:
+        _, plan = plans[key]
+    except KeyError:
+        plan = ResolutionPlan(item)
+        # Keep the fixture info alive so its id isn't reused
+        plans[key] = (item._fixtureinfo, plan)
+    return plan
+
+
+async def _teardown(teardown):
+    """Run the code after a fixture's yield"""
+    if isinstance(teardown, collections.abc.Iterator):
         try:
-            dep_fixture = _get_fixture(item, arg_name, fixture)
-        except Ignore:
-            continue
+            teardown.__next__()
+        except StopIteration:
+            pass
+    else:
+        try:
+            await teardown.__anext__()
+        except StopAsyncIteration:
+            pass
+
+
+# Eager tasks run straight away until they first suspend
+EAGER_TASKS = sys.version_info >= (3, 12)
+
+
+def start_eagerly(coro):
+    """Run a coroutine in a task, eagerly where eager tasks are available"""
+    loop = asyncio.get_running_loop()
+    if not EAGER_TASKS:
+        return loop.create_task(coro)
+
+    # Keep using the loop's task factory, eg. the loop monitor's
+    task_factory = loop.get_task_factory()
+    if task_factory is None:
+        return asyncio.Task(coro, loop=loop, eager_start=True)
+    return task_factory(loop, coro, eager_start=True)
+
+
+class FixtureResolver:
+    """Resolves the graph of fixtures used by an item.
+
+    Each fixture is set up once, as soon as all of the fixtures it depends on
+    are ready. Fixtures are set up concurrently, each in its own task. With
+    eager tasks (Python 3.12+) fixtures which never suspend are set up
+    straight away in the order they were requested."""
+
+    def __init__(self, item: Item, plan: ResolutionPlan):
+        self.item = item
+        self.plan = plan
+        self.setups = {}
+        # Teardown generators of each fixture in the order they were set up
+        self.setup_order = {}
+        self.graph = {}
+        # How long each fixture took to set up and tear down
+        self.durations = {}
+
+    def start(self, fixtures: List[Union[FixtureDef, str]]):
+        """Start setting up the fixtures, each in its own task"""
+        for fixture in fixtures:
+            if fixture not in self.setups:
+                self.setups[fixture] = start_eagerly(self._setup(fixture))
+
+    async def value(self, fixture: Union[FixtureDef, str]):
+        """Wait for the fixture, which has been started, to be set up and return
+        its value"""
+        return await self.setups[fixture]
+
+    def cancel(self):
+        for setup in self.setups.values():
+            setup.cancel()
+
+    async def abandon(self):
+        """Cancel the fixtures still being set up and tear down the ones which
+        were set up, ignoring errors"""
+        self.cancel()
+        setups = [setup for setup in self.setups.values() if not setup.done()]
+        try:
+            if setups:
+                await asyncio.wait(setups)
+            # The test reports the first error, so don't warn that the others
+            # weren't retrieved
+            for setup in self.setups.values():
+                if not setup.cancelled():
+                    setup.exception()
+            await self.teardown()
+        except Exception:
+            pass
+
+    async def teardown(self):
+        """Tear down the fixtures which were set up"""
+        if self.item.config.stash[teardown_mode_key] == "sequential":
+            # Strictly in reverse of the order fixtures were set up
+            for fixture in reversed(self.setup_order):
+                await self._teardown(fixture)
+            return
+
+        # Fixtures are torn down after every fixture which depends on them.
+        # Fixtures which don't depend on each other are torn down concurrently
+        dependents = {fixture: [] for fixture in self.setup_order}
+        for fixture in self.setup_order:
+            for dependency in self.plan.dependencies[fixture]:
+                if dependency in dependents:
+                    dependents[dependency].append(fixture)
+
+        async def teardown_fixture(fixture):
+            waiting = [teardowns[dependent] for dependent in dependents[fixture]]
+            waiting = [teardown for teardown in waiting if not teardown.done()]
+            if waiting:
+                await asyncio.wait(waiting)
+            await self._teardown(fixture)
+
+        # Dependents were set up later so they are started first
+        teardowns = {}
+        for fixture in reversed(self.setup_order):
+            teardowns[fixture] = start_eagerly(teardown_fixture(fixture))
+
+        try:
+            if teardowns:
+                await asyncio.wait(teardowns.values())
+        except asyncio.CancelledError:
+            for teardown in teardowns.values():
+                teardown.cancel()
+            raise
+
+        # Errors are reported together once every fixture has been torn down
+        errors = {
+            fixture.argname: teardown.exception()
+            for fixture, teardown in teardowns.items()
+            if not teardown.cancelled() and teardown.exception() is not None
+        }
+        if len(errors) == 1:
+            raise next(iter(errors.values()))
+        if errors:
+            raise TeardownErrors(errors)
+
+    async def _teardown(self, fixture: FixtureDef):
+        teardowns = self.setup_order[fixture]
+        if not teardowns:
+            return
+
+        start = time.perf_counter()
+        try:
+            for teardown in teardowns:
+                await _teardown(teardown)
+        finally:
+            self.durations[fixture.argname]["teardown"] = time.perf_counter() - start
+
+    async def _setup(self, fixture: Union[FixtureDef, str]):
+        if fixture is REQUEST:
+            return self.item._request
+
+        if self.item.instance is not None:
+            # Bind fixtures which are methods to this item's instance
+            fixture.func = resolve_fixture_function(fixture, self.item._request)
+
+        dependencies = self.plan.dependencies[fixture]
+
+        self.start(dependencies)
+        fixture_values = []
+        for dependency in dependencies:
+            value = await self.value(dependency)
+            if dependency is REQUEST:
+                # Set request.param for this fixture now other fixtures are ready
+                value = _get_fixture(self.item, "request", fixture)
+            fixture_values.append(value)
 
-        value, teardowns = await fill_fixture_fixtures(_fixtureinfo, dep_fixture, item)
-        values.append(value)
-        all_teardowns.extend(teardowns)
-    return values, all_teardowns
+        start = time.perf_counter()
+        setup = self.plan.setups[fixture]
+        value, teardowns = await setup(fixture, self.item, fixture_values)
+        stop = time.perf_counter()
+
+        self.setup_order[fixture] = teardowns
+        self.durations[fixture.argname] = {"setup": stop - start}
+        self.graph[fixture.argname] = {
+            "scope": fixture.scope,
+            "depends_on": [
+                getattr(dependency, "argname", "request") for dependency in dependencies
+            ],
+            "start": start,
+            "duration": stop - start,
+        }
+        return value
 
 
 class CachedFunctionBase(object):
@@ -164,11 +446,13 @@ class GenCounter:
 
 class CachedGen(CachedFunctionBase):
     """Save the result of the 1st yield.
-    Yield 2nd yield when all callers have yielded."""
+    Yield 2nd yield when all callers have yielded.
+    Managed fixtures are instead torn down by `release` at the end of their scope."""
 
-    def __init__(self, wrapped_func):
+    def __init__(self, wrapped_func, managed=False):
         super().__init__(wrapped_func)
         self.instances = set()
+        self.managed = managed
 
     def completed(self, instance):
         self.instances.remove(instance)
@@ -182,6 +466,8 @@ class CachedGen(CachedFunctionBase):
 
     def __next__(self):
         if len(self.instances) == 0:
+            if self.managed:
+                raise StopIteration
             return self.gen.__next__()
         if hasattr(self, "value"):
             return self.value
@@ -197,6 +483,21 @@ class CachedGen(CachedFunctionBase):
                 raise
             return self.value
 
+    def release(self):
+        """Tear down the fixture. It's set up again if it is used again."""
+        gen = self.__dict__.pop("gen", None)
+        self.__dict__.pop("value", None)
+        self.__dict__.pop("exception", None)
+        self.instances.clear()
+        if gen is None:
+            return
+
+        try:
+            gen.__next__()
+        except StopIteration:
+            return
+        raise Exception(f"Fixture '{self.__name__}' has more than one 'yield'")
+
 
 class AsyncGenCounter:
     def __init__(self, parent):
@@ -215,11 +516,13 @@ class AsyncGenCounter:
 
 class CachedAsyncGen(CachedFunctionBase):
     """Save the result of the 1st yield.
-    Yield 2nd yield when all callers have yielded."""
+    Yield 2nd yield when all callers have yielded.
+    Managed fixtures are instead torn down by `release` at the end of their scope."""
 
-    def __init__(self, wrapped_func):
+    def __init__(self, wrapped_func, managed=False):
         super().__init__(wrapped_func)
         self.instances = set()
+        self.managed = managed
 
     def completed(self, instance):
         self.instances.remove(instance)
@@ -233,6 +536,8 @@ class CachedAsyncGen(CachedFunctionBase):
 
     async def __anext__(self):
         if len(self.instances) == 0:
+            if self.managed:
+                raise StopAsyncIteration
             return await self.gen.__anext__()
         async with self.lock:
             if hasattr(self, "value"):
@@ -249,6 +554,22 @@ class CachedAsyncGen(CachedFunctionBase):
                     raise
                 return self.value
 
+    async def release(self):
+        """Tear down the fixture. It's set up again if it is used again."""
+        async with self.lock:
+            gen = self.__dict__.pop("gen", None)
+            self.__dict__.pop("value", None)
+            self.__dict__.pop("exception", None)
+            self.instances.clear()
+            if gen is None:
+                return
+
+            try:
+                await gen.__anext__()
+            except StopAsyncIteration:
+                return
+            raise Exception(f"Fixture '{self.__name__}' has more than one 'yield'")
+
 
 class CachedAsyncGenByArguments(CachedAsyncGen):
     """Save the result of the 1st yield.
@@ -256,7 +577,7 @@ class CachedAsyncGenByArguments(CachedAsyncGen):
     We cache based off arguments."""
 
     def __init__(self, wrapped_func):
-        super().__init__(wrapped_func)
+        super().__init__(wrapped_func, managed=True)
         self.callers_by_args = {}
 
     def __call__(self, *args, **kwargs):
@@ -264,18 +585,18 @@ class CachedAsyncGenByArguments(CachedAsyncGen):
         if args in self.callers_by_args:
             gen = self.callers_by_args[args]
         else:
-            gen = CachedAsyncGen(self.wrapped_func)
+            gen = CachedAsyncGen(self.wrapped_func, managed=True)
             self.callers_by_args[args] = gen
         return gen(*args, **kwargs)
 
+    async def release(self):
+        gens = list(self.callers_by_args.values())
+        self.callers_by_args.clear()
+        for gen in gens:
+            await gen.release()
 
-async def _make_asyncgen_fixture(
-    _fixtureinfo: FuncFixtureInfo, fixture: FixtureDef, item: Item
-):
-    fixture_values, teardowns = await _fill_fixture_fixtures(
-        _fixtureinfo, fixture, item
-    )
 
+async def _make_asyncgen_fixture(fixture: FixtureDef, item: Item, fixture_values):
     func: Union[CachedAsyncGen, CachedAsyncGenByArguments]
 
     if fixture.scope in ["module", "session"]:
@@ -296,16 +617,10 @@ async def _make_asyncgen_fixture(
 
     gen = func(*fixture_values)
     value = await gen.__anext__()
-    return value, [gen] + teardowns
-
+    return value, [gen]
 
-async def _make_coroutine_fixture(
-    _fixtureinfo: FuncFixtureInfo, fixture: FixtureDef, item: Item
-):
-    fixture_values, teardowns = await _fill_fixture_fixtures(
-        _fixtureinfo, fixture, item
-    )
 
+async def _make_coroutine_fixture(fixture: FixtureDef, item: Item, fixture_values):
     # Cache the module call
     if fixture.scope in ["module", "session"]:
         if not isinstance(fixture.func, CachedFunction):
@@ -326,19 +641,15 @@ async def _make_coroutine_fixture(
     else:
         raise Exception("unknown scope type")
 
-    return value, teardowns
+    return value, []
 
 
 async def _make_regular_generator_fixture(
-    _fixtureinfo: FuncFixtureInfo, fixture: FixtureDef, item: Item
+    fixture: FixtureDef, item: Item, fixture_values
 ):
-    fixture_values, teardowns = await _fill_fixture_fixtures(
-        _fixtureinfo, fixture, item
-    )
-
     if fixture.scope in ["module", "session"]:
         if not isinstance(fixture.func, CachedGen):
-            fixture.func = CachedGen(fixture.func)
+            fixture.func = CachedGen(fixture.func, managed=True)
         func = fixture.func
 
     elif fixture.scope in ["function"]:
@@ -353,16 +664,18 @@ async def _make_regular_generator_fixture(
         item._asyncio_cooperative_cached_functions[fixture] = func
 
     gen = func(*fixture_values)
-    return gen.__next__(), [gen] + teardowns
+    return gen.__next__(), [gen]
 
 
-async def _make_regular_fixture(
-    _fixtureinfo: FuncFixtureInfo, fixture: FixtureDef, item: Item
-):
+async def _make_pool_fixture(fixture: FixtureDef, item: Item, fixture_values):
+    # Each item leases its own resource and hands it back when torn down
+    lease = fixture.func.lease(*fixture_values)
+    value = await lease.__anext__()
+    return value, [lease]
+
+
+async def _make_regular_fixture(fixture: FixtureDef, item: Item, fixture_values):
     # FIXME: we should use more of pytest's fixture system
-    fixture_values, teardowns = await _fill_fixture_fixtures(
-        _fixtureinfo, fixture, item
-    )
 
     # Cache the module call
     if fixture.scope in ["module", "session"]:
@@ -384,39 +697,30 @@ async def _make_regular_fixture(
     else:
         raise Exception("unknown scope type")
 
-    return value, teardowns
+    return value, []
 
 
-async def fill_fixture_fixtures(
-    _fixtureinfo: FuncFixtureInfo,
-    fixture: Union[FixtureDef, FixtureRequest],
-    item: Item,
-):
-    if isinstance(fixture, FixtureRequest):
-        return fixture, []
-
-    fixture.func = resolve_fixture_function(fixture, item._request)
+def setup_function(func):
+    """Returns how to set up a fixture with the values of the fixtures it
+    depends on. Setting up returns the fixture's value and the generators to
+    tear it down with."""
+    if isinstance(func, Pool):
+        return _make_pool_fixture
 
-    if inspect.isasyncgenfunction(fixture.func) or isinstance(
-        fixture.func, CachedAsyncGen
-    ):
-        return await _make_asyncgen_fixture(_fixtureinfo, fixture, item)
+    elif inspect.isasyncgenfunction(func) or isinstance(func, CachedAsyncGen):
+        return _make_asyncgen_fixture
 
-    elif inspect.iscoroutinefunction(fixture.func) or isinstance(
-        fixture.func, CachedFunction
-    ):
-        return await _make_coroutine_fixture(_fixtureinfo, fixture, item)
+    elif inspect.iscoroutinefunction(func) or isinstance(func, CachedFunction):
+        return _make_coroutine_fixture
 
-    elif inspect.isgeneratorfunction(fixture.func) or isinstance(
-        fixture.func, CachedGen
-    ):
-        return await _make_regular_generator_fixture(_fixtureinfo, fixture, item)
+    elif inspect.isgeneratorfunction(func) or isinstance(func, CachedGen):
+        return _make_regular_generator_fixture
 
-    elif inspect.isfunction(fixture.func) or inspect.ismethod(fixture.func):
-        return await _make_regular_fixture(_fixtureinfo, fixture, item)
+    elif inspect.isfunction(func) or inspect.ismethod(func):
+        return _make_regular_fixture
 
     else:
         raise Exception(
-            f"Something is strange about the fixture '{fixture.func.__name__}'.\n"
+            f"Something is strange about the fixture '{func.__name__}'.\n"
             f"Please create an issue with reproducible sample on github."
         )
@@ -0,0 +1,61 @@
+FLAKES_CACHE_KEY = "asyncio-cooperative/flakes"
+
+
+class Flakes:
+    """How many attempts each flakey test needed, and how many of the runs it
+    was part of needed a retry, persisted across runs in pytest's cache and
+    keyed by nodeid. Registered as a plugin to record the attempts and
+    summarize them."""
+
+    def __init__(self, config):
+        self.config = config
+        self.attempts = {}
+
+        cache = getattr(config, "cache", None)
+        self.history = cache.get(FLAKES_CACHE_KEY, {}) if cache else {}
+
+    def pytest_runtest_logreport(self, report):
+        attempts = getattr(report, "asyncio_attempts", None)
+        if attempts is not None:
+            self.attempts[report.nodeid] = (attempts, report.outcome)
+
+    def pytest_sessionfinish(self):
+        # The pytest-xdist controller receives every report and saves them
+        if hasattr(self.config, "workerinput"):
+            return
+
+        for nodeid, (attempts, _) in self.attempts.items():
+            history = self.history.get(nodeid, {"runs": 0, "retried": 0})
+            self.history[nodeid] = {
+                "runs": history["runs"] + 1,
+                "retried": history["retried"] + (attempts > 1),
+            }
+
+        cache = getattr(self.config, "cache", None)
+        if cache and self.attempts:
+            cache.set(FLAKES_CACHE_KEY, self.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        retried = {
+            nodeid: (attempts, outcome)
+            for nodeid, (attempts, outcome) in self.attempts.items()
+            if attempts > 1
+        }
+        if not retried:
+            return
+
+        terminalreporter.write_sep("=", "flakey tests")
+        most_retried = sorted(retried.items(), key=lambda x: (-x[1][0], x[0]))
+        for nodeid, (attempts, outcome) in most_retried:
+            line = f"{attempts - 1} retries, {outcome} {nodeid}"
+            if nodeid in self.history:
+                history = self.history[nodeid]
+                line += f" (retried in {history['retried']} of {history['runs']} runs)"
+            terminalreporter.write_line(line)
+
+        retries = sum(attempts - 1 for attempts, _ in retried.values())
+        failed = sum(outcome == "failed" for _, outcome in retried.values())
+        terminalreporter.write_line(
+            f"{len(retried)} flakey tests were retried {retries} times, "
+            f"{failed} still failed"
+        )
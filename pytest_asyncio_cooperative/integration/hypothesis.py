@@ -3,24 +3,30 @@ import functools
 import time
 
 from ..fixtures import fill_fixtures
+from ..lifetimes import scope_lifetimes_key
+from ..loops import loop_factory_key
+from ..monitor import current_item
 
 
 async def hypothesis_test_wrapper(item):
     """
     Hypothesis is synchronous, let's run inside an executor to keep asynchronicity
     """
+    current_item.set(item)
 
     # Do setup
-    item.start_setup = time.time()
-    fixture_values, teardowns = await fill_fixtures(item)
-    item.stop_setup = time.time()
+    item.wall_start_setup = time.time()
+    item.start_setup = time.perf_counter()
+    fixture_values, teardown = await fill_fixtures(item)
+    item.stop_setup = time.perf_counter()
 
     default_loop = asyncio.get_running_loop()
     inner_test = item.function.hypothesis.inner_test
+    loop_factory = item.config.stash[loop_factory_key]
 
     def async_to_sync(*args, **kwargs):
         # FIXME: can we cache this loop across multiple runs?
-        loop = asyncio.new_event_loop()
+        loop = loop_factory()
         task = inner_test(*args, **kwargs)
         try:
             loop.run_until_complete(task)
@@ -33,10 +39,9 @@ async def hypothesis_test_wrapper(item):
     await default_loop.run_in_executor(None, wrapped_func_with_fixtures)
 
     # Do teardowns
-    item.start_teardown = time.time()
-    for teardown in teardowns:
-        try:
-            await teardown.__anext__()
-        except StopAsyncIteration:
-            pass
-    item.stop_teardown = time.time()
+    item.start_teardown = time.perf_counter()
+    try:
+        await teardown()
+    finally:
+        await item.config.stash[scope_lifetimes_key].finished(item)
+        item.stop_teardown = time.perf_counter()
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+
+def is_xdist_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+class XdistWorkerRunner:
+    """Run the cooperative items handed to a pytest-xdist worker.
+
+    xdist runs one item at a time through pytest_runtest_protocol. Cooperative
+    items are instead pushed into a scheduler on a persistent event loop and
+    the protocol returns once the item has been admitted. This way a worker
+    only asks the controller for more items while it has a free slot, and
+    items queued on a busy worker can be handed to (or stolen by) idle ones.
+
+    The event loop only runs while the worker is claiming items, so other
+    items are deferred until the cooperative ones have finished, as they are
+    without xdist. Otherwise the running tests would be frozen, but still time
+    out, while a synchronous test ran.
+    """
+
+    def __init__(self, config, new_loop, new_scheduler, report_completed):
+        self.new_loop = new_loop
+        self.new_scheduler = new_scheduler
+        self.report_completed = report_completed
+        self.loop = None
+        self.items = []
+        self.deferred = []
+        self.item_indexes = {}
+        # xdist runs its worker module through execnet, so we can't import the class
+        self.interactor = next(
+            plugin
+            for plugin in config.pluginmanager.get_plugins()
+            if type(plugin).__name__ == "WorkerInteractor"
+        )
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        # xdist expects reports to be for the item it is currently running, but
+        # cooperative items are reported whenever they finish
+        current_index = self.interactor.item_index
+        self.interactor.item_index = self.item_indexes.get(report.nodeid, current_index)
+        try:
+            yield
+        finally:
+            self.interactor.item_index = current_index
+
+    async def _start(self):
+        self.scheduler = self.new_scheduler()
+        self.reporting = asyncio.ensure_future(self.report_completed(self.scheduler))
+
+    def claim(self, item):
+        item._asyncio_claimed = True
+        self.items.append(item)
+        self.item_indexes[item.nodeid] = self.interactor.item_index
+
+        if self.loop is None:
+            self.loop = self.new_loop()
+            self.loop.run_until_complete(self._start())
+
+        self.scheduler.push(item)
+        self.loop.run_until_complete(self.scheduler.wait_for_admission())
+
+    def defer(self, item):
+        """Run a non-cooperative item once the cooperative ones have finished"""
+        item._asyncio_claimed = True
+        self.deferred.append(item)
+        self.item_indexes[item.nodeid] = self.interactor.item_index
+
+    def finish(self):
+        """Wait for the remaining items, including retries, to complete and
+        then run the deferred items"""
+        if self.loop is not None:
+            try:
+                self.scheduler.close()
+                self.loop.run_until_complete(self.reporting)
+            finally:
+                self.loop.close()
+
+        for i, item in enumerate(self.deferred):
+            if item.session.shouldfail or item.session.shouldstop:
+                break
+            nextitem = self.deferred[i + 1] if i + 1 < len(self.deferred) else None
+            item.ihook.pytest_runtest_protocol(item=item, nextitem=nextitem)
@@ -0,0 +1,82 @@
+import warnings
+from collections import Counter
+
+import pytest
+
+from .fixtures import CachedAsyncGen
+from .fixtures import CachedGen
+from .fixtures import shared_fixtures
+from .pool import Pool
+
+# Module scoped fixtures may depend on session scoped fixtures
+SCOPE_ORDER = {"module": 0, "session": 1}
+
+
+async def release(fixture):
+    if isinstance(fixture.func, CachedAsyncGen):
+        await fixture.func.release()
+    elif isinstance(fixture.func, CachedGen):
+        fixture.func.release()
+    elif isinstance(fixture.func, Pool):
+        await fixture.func.close()
+
+
+scope_lifetimes_key = pytest.StashKey["ScopeLifetimes"]()
+
+
+class ScopeLifetimes:
+    """Tears down module and session scoped generator fixtures at the end of
+    their scope, rather than whenever no running test happens to be using them.
+
+    When every item is known up front, a module scoped fixture is torn down as
+    soon as the last item using it has finished. Everything else (session
+    scoped fixtures, and module scoped fixtures when pytest-xdist hands items
+    out one at a time) is torn down by `release_all` once every test has
+    finished."""
+
+    def __init__(self, items=None):
+        self.items_known = items is not None
+        self.item_fixtures = {}
+        self.remaining = Counter()
+        self.fixtures = []
+
+        for item in items or []:
+            for fixture in self._shared_fixtures(item):
+                if fixture.scope == "module":
+                    self.remaining[fixture] += 1
+
+    def _shared_fixtures(self, item):
+        try:
+            return self.item_fixtures[item.nodeid]
+        except KeyError:
+            fixtures = self.item_fixtures[item.nodeid] = shared_fixtures(item)
+            for fixture in fixtures:
+                if fixture not in self.fixtures:
+                    self.fixtures.append(fixture)
+            return fixtures
+
+    async def finished(self, item):
+        """Called once the item's own teardowns have run. Errors tearing down
+        fixtures are raised so they are reported with the item."""
+        if getattr(item, "_asyncio_scopes_finished", False):
+            return
+        item._asyncio_scopes_finished = True
+
+        for fixture in self._shared_fixtures(item):
+            if self.items_known and fixture.scope == "module":
+                self.remaining[fixture] -= 1
+                if self.remaining[fixture] == 0:
+                    await release(fixture)
+
+    async def release_all(self):
+        fixtures = sorted(self.fixtures, key=lambda f: SCOPE_ORDER.get(f.scope, 0))
+        for fixture in fixtures:
+            try:
+                await release(fixture)
+            except Exception as e:
+                warnings.warn(
+                    pytest.PytestWarning(
+                        f"Error tearing down {fixture.scope} scoped fixture "
+                        f"'{fixture.argname}': {e!r}"
+                    )
+                )
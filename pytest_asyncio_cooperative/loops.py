@@ -0,0 +1,23 @@
+import asyncio
+import importlib
+from typing import Callable
+
+import pytest
+
+DEFAULT_LOOP_FACTORY = "asyncio.new_event_loop"
+
+loop_factory_key = pytest.StashKey[Callable[[], asyncio.AbstractEventLoop]]()
+
+
+def resolve_loop_factory(path: str) -> Callable[[], asyncio.AbstractEventLoop]:
+    """Import an event loop factory from a dotted path (eg. `uvloop.new_event_loop`
+    or `package.module:factory`)"""
+    module_name, _, name = path.replace(":", ".").rpartition(".")
+    try:
+        factory = getattr(importlib.import_module(module_name), name)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise Exception(f"Unable to import asyncio loop factory '{path}': {e}\n")
+
+    if not callable(factory):
+        raise Exception(f"asyncio loop factory '{path}' is not callable\n")
+    return factory
@@ -0,0 +1,188 @@
+import asyncio
+import collections.abc
+import contextvars
+import json
+import time
+
+# The item whose test is running in the current task. Tasks created by a test
+# (eg. by asyncio.gather) inherit it.
+current_item = contextvars.ContextVar("asyncio_cooperative_item", default=None)
+
+OUTSIDE_TESTS = "(outside tests)"
+
+
+def new_step_stats():
+    return {"steps": 0, "total": 0.0, "longest": 0.0, "slow": 0}
+
+
+class TimedCoroutine(collections.abc.Coroutine):
+    """Wraps a task's coroutine to time each step the event loop runs.
+
+    A step runs until the coroutine awaits something which isn't ready, and
+    nothing else can run on the loop in the meantime."""
+
+    def __init__(self, wrapped, monitor):
+        self.wrapped = wrapped
+        self.monitor = monitor
+
+    def _step(self, method, *args):
+        # Eager tasks start running within another task's step, which already
+        # includes them
+        if self.monitor.stepping:
+            return method(*args)
+
+        self.monitor.stepping = True
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.monitor.stepping = False
+            self.monitor.record_step(time.perf_counter() - start)
+
+    def send(self, value):
+        return self._step(self.wrapped.send, value)
+
+    def throw(self, *args):
+        return self._step(self.wrapped.throw, *args)
+
+    def close(self):
+        return self.wrapped.close()
+
+    def __await__(self):
+        return self.wrapped.__await__()
+
+    def __repr__(self):
+        return repr(self.wrapped)
+
+
+class LoopMonitor:
+    """Every cooperative test shares the event loop, so a test which doesn't
+    yield stalls every other test. Registered as a plugin to report the tests
+    which blocked the loop the longest.
+
+    Synchronous tests run inline on the loop are always measured. With
+    --asyncio-loop-monitor every step of every task is timed and attributed to
+    the test it ran for, and a heartbeat measures how late the loop runs
+    callbacks."""
+
+    # Seconds a test may block the loop before it is worth warning about
+    threshold = 0.1
+    limit = 5
+    heartbeat_interval = 0.05
+
+    def __init__(self, config):
+        self.json_path = config.getoption("--asyncio-loop-monitor-json") or (
+            config.getini("asyncio_loop_monitor_json")
+        )
+        self.enabled = bool(
+            config.getoption("--asyncio-loop-monitor")
+            or config.getini("asyncio_loop_monitor")
+            or self.json_path
+        )
+        self.rootpath = config.rootpath
+        self.blocked = {}
+        self.steps = {}
+        self.outside_tests = new_step_stats()
+        self.lags = []
+        self.stepping = False
+
+    def attach(self, loop):
+        if not self.enabled:
+            return
+        loop.set_task_factory(self._task_factory)
+        loop.call_soon(self._heartbeat, loop, loop.time())
+
+    def _task_factory(self, loop, coro, **kwargs):
+        return asyncio.Task(TimedCoroutine(coro, self), loop=loop, **kwargs)
+
+    def _heartbeat(self, loop, expected):
+        now = loop.time()
+        self.lags.append(now - expected)
+        expected = now + self.heartbeat_interval
+        loop.call_at(expected, self._heartbeat, loop, expected)
+
+    def record_step(self, duration):
+        item = current_item.get()
+        if item is None:
+            stats = self.outside_tests
+        else:
+            stats = item.__dict__.setdefault("loop_steps", new_step_stats())
+
+        stats["steps"] += 1
+        stats["total"] += duration
+        stats["longest"] = max(stats["longest"], duration)
+        if duration >= self.threshold:
+            stats["slow"] += 1
+
+    def pytest_runtest_logreport(self, report):
+        blocked = getattr(report, "asyncio_loop_blocked", None)
+        if blocked is not None and blocked >= self.threshold:
+            self.blocked[report.nodeid] = blocked
+
+        steps = getattr(report, "asyncio_loop_steps", None)
+        if steps is not None:
+            self.steps[report.nodeid] = steps
+
+    def top_blockers(self):
+        steps = dict(self.steps)
+        if self.outside_tests["steps"]:
+            steps[OUTSIDE_TESTS] = self.outside_tests
+        return sorted(steps.items(), key=lambda x: x[1]["longest"], reverse=True)
+
+    def lag_summary(self):
+        # The heartbeat only runs in the process which ran the event loop
+        if not self.lags:
+            return None
+        return {
+            "heartbeats": len(self.lags),
+            "max": max(self.lags),
+            "mean": sum(self.lags) / len(self.lags),
+        }
+
+    def pytest_sessionfinish(self, session):
+        if not self.json_path or hasattr(session.config, "workerinput"):
+            return
+
+        data = {
+            "lag": self.lag_summary(),
+            "blockers": [
+                {"nodeid": nodeid, **stats} for nodeid, stats in self.top_blockers()
+            ],
+        }
+        with open(self.rootpath / self.json_path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.enabled:
+            self._summarize_steps(terminalreporter)
+
+        if not self.blocked:
+            return
+
+        terminalreporter.write_sep(
+            "=", "synchronous tests blocking the event loop", yellow=True
+        )
+        longest = sorted(self.blocked.items(), key=lambda x: x[1], reverse=True)
+        for nodeid, blocked in longest[: self.limit]:
+            terminalreporter.write_line(f"{blocked:.2f}s {nodeid}")
+        terminalreporter.write_line(
+            "Use --asyncio-sync-executor=thread to run them in a thread pool"
+        )
+
+    def _summarize_steps(self, terminalreporter):
+        top_blockers = self.top_blockers()
+        lag = self.lag_summary()
+        if not top_blockers and lag is None:
+            return
+
+        terminalreporter.write_sep("=", "top loop blockers")
+        if lag is not None:
+            terminalreporter.write_line(
+                f"event loop lag: max {lag['max']:.3f}s, mean {lag['mean']:.3f}s "
+                f"over {lag['heartbeats']} heartbeats"
+            )
+        for nodeid, stats in top_blockers[: self.limit]:
+            terminalreporter.write_line(
+                f"{stats['longest']:.3f}s longest step, {stats['total']:.3f}s total, "
+                f"{stats['slow']} slow steps {nodeid}"
+            )
@@ -0,0 +1,31 @@
+from .fixtures import shared_fixtures
+
+
+def collection_order(items, durations):
+    return list(items)
+
+
+def longest_first(items, durations):
+    """Admit the tests expected to take longest first so they don't become a
+    long tail once every other test has finished (LPT scheduling)"""
+    expected = durations.estimate(items)
+    by_duration = sorted(range(len(items)), key=lambda i: expected[i], reverse=True)
+    return [items[i] for i in by_duration]
+
+
+def grouped(items, durations):
+    """Admit tests which share module and session scoped fixtures one after
+    another, so expensive fixtures are used by a burst of tests and released
+    instead of being held while unrelated tests run. Groups are in the order of
+    their first test, and tests keep their collection order within a group."""
+    groups = {}
+    for item in items:
+        groups.setdefault(frozenset(shared_fixtures(item)), []).append(item)
+    return [item for group in groups.values() for item in group]
+
+
+ORDERS = {
+    "collection": collection_order,
+    "longest-first": longest_first,
+    "grouped": grouped,
+}
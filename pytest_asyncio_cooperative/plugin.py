@@ -1,17 +1,55 @@
 import asyncio
-import collections.abc
+import concurrent.futures
+import functools
 import inspect
-import threading
 import time
 from sys import version_info as sys_version_info
+from typing import Optional
 
 import pytest
 from _pytest.skipping import Skip
 from _pytest.skipping import evaluate_skip_marks
 
 from .assertion import activate_assert_rewrite
+from .concurrency import AdaptiveConcurrency
+from .durations import Durations
+from .fixture_durations import FixtureDurations
+from .fixture_graph import FixtureGraphs
+from .flakes import Flakes
+from .fixtures import TEARDOWN_MODES
 from .fixtures import fill_fixtures
+from .fixtures import teardown_mode_key
 from .integration.hypothesis import hypothesis_test_wrapper
+from .integration.xdist import XdistWorkerRunner
+from .integration.xdist import is_xdist_worker
+from .lifetimes import ScopeLifetimes
+from .lifetimes import scope_lifetimes_key
+from .loops import DEFAULT_LOOP_FACTORY
+from .loops import loop_factory_key
+from .loops import resolve_loop_factory
+from .monitor import LoopMonitor
+from .monitor import TimedCoroutine
+from .monitor import current_item
+from .ordering import ORDERS
+from .reporter import REPORTERS
+from .rerun import RerunExecutor
+from .resources import ResourceLimits
+from .resources import check_resources
+from .resources import parse_resource_limits
+from .resources import resource_limits_key
+from .scheduler import Scheduler
+from .scheduler import cancel_task
+from .scheduler import get_item_timeout
+from .workers import run_workers
+from .workers import worker_position
+
+rerun_executor_key = pytest.StashKey[RerunExecutor]()
+durations_key = pytest.StashKey[Durations]()
+xdist_runner_key = pytest.StashKey[XdistWorkerRunner]()
+loop_monitor_key = pytest.StashKey[LoopMonitor]()
+fixture_graphs_key = pytest.StashKey[FixtureGraphs]()
+fixture_durations_key = pytest.StashKey[FixtureDurations]()
+flakes_key = pytest.StashKey[Flakes]()
 
 
 def pytest_addoption(parser):
@@ -19,14 +57,59 @@ def pytest_addoption(parser):
         "--max-asyncio-tasks",
         action="store",
         default=None,
-        help="asyncio: maximum number of tasks to run concurrently (int)",
+        help="asyncio: maximum number of tasks to run concurrently (int), or 'auto' "
+        "to adjust it to how quickly tests complete",
     )
     parser.addini(
         "max_asyncio_tasks",
-        "asyncio: maximum number of tasks to run concurrently (int)",
+        "asyncio: maximum number of tasks to run concurrently (int), or 'auto' to "
+        "adjust it to how quickly tests complete",
         default=100,
     )
 
+    parser.addoption(
+        "--asyncio-concurrency-log",
+        action="store",
+        default=None,
+        help="asyncio: write how --max-asyncio-tasks=auto adjusted the number of "
+        "concurrent tasks to this JSON file",
+    )
+    parser.addini(
+        "asyncio_concurrency_log",
+        "asyncio: write how --max-asyncio-tasks=auto adjusted the number of "
+        "concurrent tasks to this JSON file",
+        default=None,
+    )
+
+    parser.addoption(
+        "--max-asyncio-tasks-total",
+        action="store",
+        default=None,
+        help="asyncio: maximum number of tasks to run concurrently, divided between "
+        "all worker processes (int)",
+    )
+    parser.addini(
+        "max_asyncio_tasks_total",
+        "asyncio: maximum number of tasks to run concurrently, divided between all "
+        "worker processes (int)",
+        default=None,
+    )
+
+    parser.addoption(
+        "--asyncio-resource-limits",
+        action="store",
+        default=None,
+        help="asyncio: how much of each named resource the running tests may use "
+        "at once, eg. 'db:10 s3:50'",
+    )
+    parser.addini(
+        "asyncio_resource_limits",
+        "asyncio: how much of each named resource the running tests may use at "
+        "once, eg. db:10 s3:50",
+        type="args",
+        default=[],
+    )
+
     parser.addoption(
         "--asyncio-task-timeout",
         action="store",
@@ -39,79 +122,356 @@ def pytest_addoption(parser):
         default=600,
     )
 
+    parser.addoption(
+        "--asyncio-scheduler",
+        action="store",
+        default=None,
+        help="asyncio: how tests are admitted, 'queue' or the older 'legacy' loop",
+    )
+    parser.addini(
+        "asyncio_scheduler",
+        "asyncio: how tests are admitted, 'queue' or the older 'legacy' loop",
+        default="queue",
+    )
+
+    parser.addoption(
+        "--asyncio-order",
+        action="store",
+        default=None,
+        help="asyncio: order tests are admitted in, 'collection', 'longest-first' "
+        "using durations from previous runs, or 'grouped' by shared fixtures",
+    )
+    parser.addini(
+        "asyncio_order",
+        "asyncio: order tests are admitted in, 'collection', 'longest-first' using "
+        "durations from previous runs, or 'grouped' by shared fixtures",
+        default="collection",
+    )
+
+    parser.addoption(
+        "--asyncio-teardown",
+        action="store",
+        default=None,
+        help="asyncio: tear down independent fixtures 'concurrent'ly or strictly "
+        "'sequential' in reverse setup order",
+    )
+    parser.addini(
+        "asyncio_teardown",
+        "asyncio: tear down independent fixtures 'concurrent'ly or strictly "
+        "'sequential' in reverse setup order",
+        default="concurrent",
+    )
+
+    parser.addoption(
+        "--asyncio-reporter",
+        action="store",
+        default=None,
+        help="asyncio: where finished tests are reported, 'inline' on the event "
+        "loop or on a separate 'thread'",
+    )
+    parser.addini(
+        "asyncio_reporter",
+        "asyncio: where finished tests are reported, 'inline' on the event loop "
+        "or on a separate 'thread'",
+        default="inline",
+    )
+
+    parser.addoption(
+        "--asyncio-thread-workers",
+        action="store",
+        default=None,
+        help="asyncio: number of threads running synchronous cooperative_thread "
+        "tests (int)",
+    )
+    parser.addini(
+        "asyncio_thread_workers",
+        "asyncio: number of threads running synchronous cooperative_thread tests (int)",
+        default=8,
+    )
+
+    parser.addoption(
+        "--asyncio-sync-executor",
+        action="store",
+        default=None,
+        help="asyncio: where synchronous asyncio_cooperative tests run, 'inline' on "
+        "the event loop or in a 'thread' pool",
+    )
+    parser.addini(
+        "asyncio_sync_executor",
+        "asyncio: where synchronous asyncio_cooperative tests run, 'inline' on the "
+        "event loop or in a 'thread' pool",
+        default="inline",
+    )
+
+    parser.addoption(
+        "--asyncio-workers",
+        action="store",
+        default=None,
+        help="asyncio: number of processes to split cooperative tests across, each "
+        "with its own event loop (int)",
+    )
+    parser.addini(
+        "asyncio_workers",
+        "asyncio: number of processes to split cooperative tests across, each with "
+        "its own event loop (int)",
+        default=1,
+    )
+
+    parser.addoption(
+        "--asyncio-loop-monitor",
+        action="store_true",
+        default=False,
+        help="asyncio: time every step run on the event loop and report the tests "
+        "which blocked it the longest",
+    )
+    parser.addini(
+        "asyncio_loop_monitor",
+        "asyncio: time every step run on the event loop and report the tests which "
+        "blocked it the longest",
+        type="bool",
+        default=False,
+    )
+
+    parser.addoption(
+        "--asyncio-loop-monitor-json",
+        action="store",
+        default=None,
+        help="asyncio: write the event loop monitor's measurements to this JSON file",
+    )
+    parser.addini(
+        "asyncio_loop_monitor_json",
+        "asyncio: write the event loop monitor's measurements to this JSON file",
+        default=None,
+    )
+
+    parser.addoption(
+        "--asyncio-loop-factory",
+        action="store",
+        default=None,
+        help="asyncio: dotted path to a function which creates the event loops "
+        "tests run on (eg. uvloop.new_event_loop)",
+    )
+    parser.addini(
+        "asyncio_loop_factory",
+        "asyncio: dotted path to a function which creates the event loops tests run "
+        "on (eg. uvloop.new_event_loop)",
+        default=DEFAULT_LOOP_FACTORY,
+    )
+
+    parser.addoption(
+        "--asyncio-fixture-graph",
+        action="store",
+        default=None,
+        help="asyncio: write the fixtures each cooperative test was set up with, "
+        "their dependencies and setup times to this JSON file",
+    )
+    parser.addini(
+        "asyncio_fixture_graph",
+        "asyncio: write the fixtures each cooperative test was set up with, their "
+        "dependencies and setup times to this JSON file",
+        default=None,
+    )
+
+    parser.addoption(
+        "--asyncio-fixture-durations",
+        action="store",
+        default=None,
+        help="asyncio: show the N slowest fixture setup and teardown durations of "
+        "cooperative tests (N=0 for all)",
+    )
+    parser.addini(
+        "asyncio_fixture_durations",
+        "asyncio: show the N slowest fixture setup and teardown durations of "
+        "cooperative tests (N=0 for all)",
+        default=None,
+    )
+
 
 def pytest_configure(config):
     config.addinivalue_line(
         "markers",
-        "asyncio_cooperative: run an async test cooperatively with other async tests.",
+        "asyncio_cooperative(timeout=None, resources=None): run an async test "
+        "cooperatively with other async tests. timeout overrides "
+        "--asyncio-task-timeout for this test. resources maps names from "
+        "asyncio_resource_limits to how much of each the test uses, eg. "
+        '{"db": 1}.',
+    )
+    config.addinivalue_line(
+        "markers",
+        "flakey(retries=1, backoff=0): if this test fails then run it again, up to "
+        "`retries` more times. Waits `backoff` seconds before the first retry and "
+        "twice as long before each one after it.",
     )
     config.addinivalue_line(
-        "markers", "flakey: if this test fails then run it one more time."
+        "markers",
+        "cooperative_thread(timeout=None, resources=None): run a synchronous test in "
+        "a thread pool while cooperative tests run on the event loop.",
+    )
+    config.stash[loop_factory_key] = resolve_loop_factory(
+        config.getoption("--asyncio-loop-factory")
+        or config.getini("asyncio_loop_factory")
+    )
+    config.stash[rerun_executor_key] = RerunExecutor(config.stash[loop_factory_key])
+
+    teardown_mode = config.getoption("--asyncio-teardown") or config.getini(
+        "asyncio_teardown"
+    )
+    if teardown_mode not in TEARDOWN_MODES:
+        raise Exception(
+            f"Unknown asyncio teardown '{teardown_mode}'.\n"
+            f"Choose one of: {', '.join(TEARDOWN_MODES)}\n"
+        )
+    config.stash[teardown_mode_key] = teardown_mode
+
+    resource_limits = config.getoption("--asyncio-resource-limits")
+    config.stash[resource_limits_key] = parse_resource_limits(
+        resource_limits.replace(",", " ").split()
+        if resource_limits
+        else config.getini("asyncio_resource_limits")
+    )
+
+    config.stash[durations_key] = Durations(config)
+    config.pluginmanager.register(
+        config.stash[durations_key], "asyncio-cooperative-durations"
+    )
+    config.stash[loop_monitor_key] = LoopMonitor(config)
+    config.pluginmanager.register(
+        config.stash[loop_monitor_key], "asyncio-cooperative-loop-monitor"
     )
+    config.stash[fixture_graphs_key] = FixtureGraphs(config)
+    config.pluginmanager.register(
+        config.stash[fixture_graphs_key], "asyncio-cooperative-fixture-graphs"
+    )
+    config.stash[fixture_durations_key] = FixtureDurations(config)
+    config.pluginmanager.register(
+        config.stash[fixture_durations_key], "asyncio-cooperative-fixture-durations"
+    )
+    config.stash[flakes_key] = Flakes(config)
+    config.pluginmanager.register(
+        config.stash[flakes_key], "asyncio-cooperative-flakes"
+    )
+
+
+def pytest_unconfigure(config):
+    config.stash[rerun_executor_key].close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    rerun_executor = config.stash[rerun_executor_key]
+    if rerun_executor.calls and config.option.verbose > 0:
+        terminalreporter.write_line(
+            f"asyncio-cooperative: {rerun_executor.calls} tests were rerun"
+        )
 
 
-@pytest.hookspec
+def set_call_timings(item, call, start: float, stop: float):
+    # Timings are taken from a monotonic clock so they aren't thrown off by the
+    # system clock being adjusted. Reports show wall clock times, which are
+    # worked out from the wall clock time the item's setup started at
+    call.start = item.wall_start_setup + (start - item.start_setup)
+    call.stop = call.start + (stop - start)
+    call.duration = stop - start
+
+
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     # Tests are run outside of the normal place, so we have to inject our timings
 
     if call.when == "call":
         if hasattr(item, "start") and hasattr(item, "stop"):
-            call.start = item.start
-            call.stop = item.stop
-            call.duration = call.stop - call.start
+            set_call_timings(item, call, item.start, item.stop)
 
     elif call.when == "setup":
         if hasattr(item, "start_setup") and hasattr(item, "stop_setup"):
-            call.start = item.start_setup
-            call.stop = item.stop_setup
-            call.duration = call.stop - call.start
+            set_call_timings(item, call, item.start_setup, item.stop_setup)
 
     elif call.when == "teardown":
         if hasattr(item, "start_teardown") and hasattr(item, "stop_teardown"):
-            call.start = item.start_teardown
-            call.stop = item.stop_teardown
-            call.duration = call.stop - call.start
+            set_call_timings(item, call, item.start_teardown, item.stop_teardown)
+
+    outcome = yield
+
+    if call.when == "call":
+        report = outcome.get_result()
+        if hasattr(item, "loop_blocked"):
+            report.asyncio_loop_blocked = item.loop_blocked
+        if hasattr(item, "loop_steps"):
+            report.asyncio_loop_steps = item.loop_steps
+        if getattr(item, "_flakey", False):
+            report.asyncio_attempts = item._attempts
+
+        fixture_graphs = item.config.stash[fixture_graphs_key]
+        if fixture_graphs.path and hasattr(item, "fixture_graph"):
+            report.asyncio_fixture_graph = fixture_graphs.graph(item)
+
+    elif call.when == "teardown":
+        report = outcome.get_result()
+        fixture_durations = item.config.stash[fixture_durations_key]
+        if fixture_durations.enabled and hasattr(item, "fixture_durations"):
+            report.asyncio_fixture_durations = item.fixture_durations
+            report.user_properties.extend(
+                fixture_durations.user_properties(item.fixture_durations)
+            )
+
+
+async def run_in_thread(func):
+    """Run the function in the loop's executor. Threads can't be stopped, so if
+    cancelled this still waits for the function to return, before the fixtures
+    it uses are torn down, and then raises CancelledError"""
+    future = asyncio.get_running_loop().run_in_executor(None, func)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait([future])
+            except asyncio.CancelledError:
+                pass
+        raise
 
 
 async def test_wrapper(item):
+    current_item.set(item)
+
     # Do setup
-    item.start_setup = time.time()
-    fixture_values, teardowns = await fill_fixtures(item)
-    item.stop_setup = time.time()
+    item.wall_start_setup = time.time()
+    item.start_setup = time.perf_counter()
+    fixture_values, teardown = await fill_fixtures(item)
+    item.stop_setup = time.perf_counter()
 
     # This is a class method test so prepend `self`
     if item.instance:
         fixture_values.insert(0, item.instance)
 
     async def do_teardowns():
-        item.start_teardown = time.time()
-        for teardown in teardowns:
-            if isinstance(teardown, collections.abc.Iterator):
-                try:
-                    teardown.__next__()
-                except StopIteration:
-                    pass
-            else:
-                try:
-                    await teardown.__anext__()
-                except StopAsyncIteration:
-                    pass
-        item.stop_teardown = time.time()
+        item.start_teardown = time.perf_counter()
+        try:
+            await teardown()
+        finally:
+            await item.config.stash[scope_lifetimes_key].finished(item)
+            item.stop_teardown = time.perf_counter()
 
     # Run test
-    item.start = time.time()
+    item.start = time.perf_counter()
     try:
         if inspect.iscoroutinefunction(item.function):
             await item.function(*fixture_values)
+        elif item._in_thread:
+            await run_in_thread(functools.partial(item.function, *fixture_values))
         else:
-            item.function(*fixture_values)
+            # Runs on the event loop so every other test is blocked until it returns
+            blocking_start = time.perf_counter()
+            try:
+                item.function(*fixture_values)
+            finally:
+                item.loop_blocked = time.perf_counter() - blocking_start
     except:
         # Teardown here otherwise we might leave fixtures with locks acquired
-        item.stop = time.time()
+        item.stop = time.perf_counter()
         await do_teardowns()
         raise
 
-    item.stop = time.time()
+    item.stop = time.perf_counter()
     await do_teardowns()
 
 
@@ -124,125 +484,197 @@ def item_to_task(item):
 
 def get_coro(task):
     if sys_version_info >= (3, 8):
-        return task.get_coro()
+        coro = task.get_coro()
     else:
-        return task._coro
-
+        coro = task._coro
 
-def cancel_task(task, now, item):
-    if sys_version_info >= (3, 9):
-        msg = "Test took too long ({:.2f} s)".format(now - item.enqueue_time)
-        task.cancel(msg=msg)
-    else:
-        task.cancel()
+    # The loop monitor wraps the coroutines of the tasks it times
+    if isinstance(coro, TimedCoroutine):
+        return coro.wrapped
+    return coro
 
 
 def wrap_in_sync(item, result):
     def outer():
         def sync_wrapper():
-            new_task = item_to_task(item)
+            # Function scoped fixtures were torn down after the previous run, so
+            # don't reuse their cached values
+            item.__dict__.pop("_asyncio_cooperative_cached_functions", None)
 
-            # We use a new thread because we can't block for an async function
-            # in the same thread as the current running event loop, nor
-            # we can nest event loops
-            result = None
+            return item.config.stash[rerun_executor_key].run(item_to_task(item))
 
-            def run_in_thread():
-                nonlocal result
-                try:
-                    result = asyncio.run(new_task)
-                except Exception as e:
-                    result = e
+        item.runtest = sync_wrapper
 
-            thread = threading.Thread(target=run_in_thread)
-            thread.start()
-            thread.join()
+        interrupted = getattr(item, "_asyncio_interrupted", None)
+        if interrupted is not None and result.cancelled():
+            pytest.skip(f"Interrupted: {interrupted}")
 
-            if isinstance(result, Exception):
-                raise result  # type: ignore
+        return result.result()
 
-            return result
+    return outer
 
-        item.runtest = sync_wrapper
 
-        return result.result()
+def retry_flakey(item, result) -> Optional[float]:
+    """How long to wait before running a failed flakey test again, or None if
+    it shouldn't be run again"""
+    if item._attempts > item._retries or hasattr(item, "_asyncio_interrupted"):
+        return None
 
-    return outer
+    try:
+        result.result()
+    except:
+        # Wait twice as long before each retry
+        delay = item._backoff * 2 ** (item._attempts - 1)
+        item._attempts += 1
 
+        # Function scoped fixtures were torn down after the failed attempt, so
+        # don't reuse their cached values
+        item.__dict__.pop("_asyncio_cooperative_cached_functions", None)
+        return delay
+    return None
 
-async def run_tests(tasks, max_tasks: int, session, item_by_coro):
-    flakes_to_retry = []
 
-    sidelined_tasks = tasks[max_tasks:]
-    tasks = tasks[:max_tasks]
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Cooperative tests set up their fixtures when they run, so a fixture which
+    # failed to set up is reported here
+    error = getattr(item, "_asyncio_setup_error", None)
+    if error is not None:
+        raise error
+
+
+def report_result(item, result):
+    if result.cancelled():
+        # Interrupted, eg. while a retry waited out its backoff, so a setup
+        # error from an earlier attempt isn't reported
+        item.__dict__.pop("_asyncio_setup_error", None)
+    elif hasattr(item, "_asyncio_setup_error"):
+        # Reported from the setup, so the test's result isn't retrieved
+        result.exception()
+
+    # We need to change .runtest to a synchronous function for pytest
+    # however, if it is called again by retry libraries we need to rerun
+    # the test instead of retuning the previous result
+    item.runtest = wrap_in_sync(item, result)
+
+    item.ihook.pytest_runtest_protocol(item=item, nextitem=None)
+
+    # Hack: See rewrite comment below
+    # pytest_runttest_protocl will disable the rewrite assertion
+    # so we renable it here
+    activate_assert_rewrite(item)
+
+
+# How often to check whether pytest has been asked to stop
+STOP_CHECK_INTERVAL = 0.1
+
+
+def stop_reason(session) -> Optional[str]:
+    """Why pytest has been asked to stop, eg. by -x/--maxfail"""
+    reason = session.shouldfail or session.shouldstop
+    return str(reason) if reason else None
+
+
+async def wait_for_stop(session) -> str:
+    while stop_reason(session) is None:
+        await asyncio.sleep(STOP_CHECK_INTERVAL)
+    return stop_reason(session)
 
-    task_timeout = int(
+
+def raise_if_stopping(session):
+    if session.shouldfail:
+        raise session.Failed(session.shouldfail)
+    if session.shouldstop:
+        raise session.Interrupted(session.shouldstop)
+
+
+def get_task_timeout(session) -> int:
+    return int(
         session.config.getoption("--asyncio-task-timeout")
         or session.config.getini("asyncio_task_timeout")
     )
 
+
+async def retry_after(item, delay: float):
+    await asyncio.sleep(delay)
+    await item_to_task(item)
+
+
+async def run_tests(items, max_tasks: int, session):
+    # Coerce into tasks
+    item_by_coro = {}
+    tasks = []
+    for item in items:
+        task = item_to_task(item)
+        item_by_coro[task] = item
+        tasks.append(task)
+
+    sidelined_tasks = tasks[max_tasks:]
+    tasks = tasks[:max_tasks]
+
+    task_timeout = get_task_timeout(session)
+    loop = asyncio.get_running_loop()
+
     completed = []
-    cancelled = []
+    cancelled = set()
+    interrupted = False
     while tasks:
         # Schedule all the coroutines
         for i in range(len(tasks)):
             if asyncio.iscoroutine(tasks[i]):
                 tasks[i] = asyncio.create_task(tasks[i])
 
-        # Mark when the task was started
-        earliest_enqueue_time = time.time()
+        # Stop admitting tests and cancel the running ones if pytest should stop
+        reason = stop_reason(session)
+        if reason is not None and not interrupted:
+            interrupted = True
+            for coro in sidelined_tasks:
+                coro.close()
+            sidelined_tasks = []
+            for task in tasks:
+                item_by_coro[get_coro(task)]._asyncio_interrupted = reason
+                task.cancel()
+
+        # Mark when the task was started and wake up at the next deadline
+        next_deadline = loop.time() + 30
         for task in tasks:
-            if isinstance(task, asyncio.Task):
-                item = item_by_coro[get_coro(task)]
-            else:
-                item = item_by_coro[task]
+            item = item_by_coro[get_coro(task)]
             if not hasattr(item, "enqueue_time"):
-                item.enqueue_time = time.time()
-            earliest_enqueue_time = min(item.enqueue_time, earliest_enqueue_time)
+                item.enqueue_time = loop.time()
+            if task not in cancelled:
+                deadline = item.enqueue_time + get_item_timeout(item, task_timeout)
+                next_deadline = min(deadline, next_deadline)
 
-        time_to_wait = (time.time() - earliest_enqueue_time) - task_timeout
         done, pending = await asyncio.wait(
             tasks,
             return_when=asyncio.FIRST_COMPLETED,
-            timeout=min(30, int(time_to_wait)),
+            timeout=max(0, min(next_deadline - loop.time(), STOP_CHECK_INTERVAL)),
         )
 
         # Cancel tasks that have taken too long
         tasks = []
         for task in pending:
-            now = time.time()
+            now = loop.time()
             item = item_by_coro[get_coro(task)]
-            if task not in cancelled and task_timeout < now - item.enqueue_time:
+            timeout = get_item_timeout(item, task_timeout)
+            if task not in cancelled and timeout <= now - item.enqueue_time:
                 cancel_task(task, now, item)
-                cancelled.append(task)
+                cancelled.add(task)
             tasks.append(task)
 
         for result in done:
             item = item_by_coro[get_coro(result)]
 
-            # Flakey tests will be run again if they failed
-            # TODO: add retry count
-            if item._flakey:
-                try:
-                    result.result()
-                except:
-                    item._flakey = None
-                    new_task = item_to_task(item)
-                    flakes_to_retry.append(new_task)
-                    item_by_coro[new_task] = item
-                    continue
-
-            # We need to change .runtest to a synchronous function for pytest
-            # however, if it is called again by retry libraries we need to rerun
-            # the test instead of retuning the previous result
-            item.runtest = wrap_in_sync(item, result)
-
-            item.ihook.pytest_runtest_protocol(item=item, nextitem=None)
-
-            # Hack: See rewrite comment below
-            # pytest_runttest_protocl will disable the rewrite assertion
-            # so we renable it here
-            activate_assert_rewrite(item)
+            delay = retry_flakey(item, result)
+            if delay is not None:
+                # Run it again once there's room, timing out from when it starts
+                task = retry_after(item, delay)
+                item_by_coro[task] = item
+                item.enqueue_time = loop.time() + delay
+                sidelined_tasks.insert(0, task)
+                continue
+
+            report_result(item, result)
 
             completed.append(result)
 
@@ -250,24 +682,250 @@ async def run_tests(tasks, max_tasks: int, session, item_by_coro):
             if len(tasks) < max_tasks:
                 tasks.append(sidelined_tasks.pop(0))
 
-    return flakes_to_retry
+    await session.config.stash[scope_lifetimes_key].release_all()
+
+
+def get_max_tasks(config) -> int:
+    max_tasks_total = config.getoption("--max-asyncio-tasks-total") or config.getini(
+        "max_asyncio_tasks_total"
+    )
+    if not max_tasks_total:
+        if is_adaptive(config):
+            return AdaptiveConcurrency.initial_limit
+        return int(
+            config.getoption("--max-asyncio-tasks")
+            or config.getini("max_asyncio_tasks")
+        )
+
+    # Divide the budget between every process running cooperative tests
+    index, count = worker_position(config)
+    share, remainder = divmod(int(max_tasks_total), count)
+    return max(1, share + (index < remainder))
+
+
+def is_adaptive(config) -> bool:
+    """Whether --max-asyncio-tasks=auto should pick the number of tasks"""
+    max_tasks_total = config.getoption("--max-asyncio-tasks-total") or config.getini(
+        "max_asyncio_tasks_total"
+    )
+    max_tasks = config.getoption("--max-asyncio-tasks") or config.getini(
+        "max_asyncio_tasks"
+    )
+    return not max_tasks_total and max_tasks == "auto"
+
+
+def new_concurrency(config) -> Optional[AdaptiveConcurrency]:
+    if not is_adaptive(config):
+        return None
+
+    log_path = config.getoption("--asyncio-concurrency-log") or config.getini(
+        "asyncio_concurrency_log"
+    )
+    if log_path:
+        # Every process running cooperative tests adjusts its own concurrency
+        log_path = config.rootpath / log_path
+        index, count = worker_position(config)
+        if count > 1:
+            log_path = log_path.with_name(f"{log_path.stem}-{index}{log_path.suffix}")
+    return AdaptiveConcurrency(log_path)
+
+
+def new_scheduler(session):
+    # Coroutines are only created once a test is admitted into a free slot
+    return Scheduler(
+        get_max_tasks(session.config),
+        get_task_timeout(session),
+        item_to_task,
+        new_concurrency(session.config),
+        ResourceLimits(session.config.stash[resource_limits_key]),
+    )
+
+
+async def report_completed(scheduler, session):
+    loop = asyncio.get_running_loop()
 
+    def report(item, result):
+        report_result(item, result)
 
-def _run_test_loop(tasks, session, item_by_coro):
-    max_tasks = int(
-        session.config.getoption("--max-asyncio-tasks")
-        or session.config.getini("max_asyncio_tasks")
+        # Stop straight away if the report reached -x/--maxfail, this may be
+        # on the reporter's thread
+        reason = stop_reason(session)
+        if reason is not None:
+            loop.call_soon_threadsafe(scheduler.interrupt, reason)
+
+    reporter_name = session.config.getoption(
+        "--asyncio-reporter"
+    ) or session.config.getini("asyncio_reporter")
+    try:
+        reporter = REPORTERS[reporter_name](report)
+    except KeyError:
+        raise Exception(
+            f"Unknown asyncio reporter '{reporter_name}'.\n"
+            f"Choose one of: {', '.join(REPORTERS)}\n"
+        )
+
+    # pytest can also be asked to stop from elsewhere, eg. by the parent of
+    # --asyncio-workers processes
+    stopping = asyncio.ensure_future(wait_for_stop(session))
+    stopping.add_done_callback(
+        lambda f: f.cancelled() or scheduler.interrupt(f.result())
     )
 
-    loop = asyncio.new_event_loop()
     try:
-        return loop.run_until_complete(
-            run_tests(tasks, int(max_tasks), session, item_by_coro)
+        async for item, result in scheduler:
+            delay = retry_flakey(item, result)
+            if delay is not None:
+                scheduler.retry(item, delay)
+                continue
+
+            reporter.submit(item, result)
+    finally:
+        stopping.cancel()
+        reporter.close()
+        if scheduler.concurrency is not None:
+            scheduler.concurrency.write_log()
+
+    # Session scoped fixtures last until every test, including retries, has run
+    await session.config.stash[scope_lifetimes_key].release_all()
+
+
+async def run_tests_queued(items, max_tasks: int, session):
+    scheduler = new_scheduler(session)
+    for item in items:
+        scheduler.push(item)
+    scheduler.close()
+
+    await report_completed(scheduler, session)
+
+
+SCHEDULERS = {
+    "queue": run_tests_queued,
+    "legacy": run_tests,
+}
+
+
+def new_event_loop(config):
+    loop = config.stash[loop_factory_key]()
+
+    # Synchronous tests marked with cooperative_thread run in the default executor
+    thread_workers = int(
+        config.getoption("--asyncio-thread-workers")
+        or config.getini("asyncio_thread_workers")
+    )
+    loop.set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=thread_workers, thread_name_prefix="asyncio-cooperative"
+        )
+    )
+
+    config.stash[loop_monitor_key].attach(loop)
+    return loop
+
+
+def order_items(items, config):
+    order_name = config.getoption("--asyncio-order") or config.getini("asyncio_order")
+    try:
+        order = ORDERS[order_name]
+    except KeyError:
+        raise Exception(
+            f"Unknown asyncio order '{order_name}'.\n"
+            f"Choose one of: {', '.join(ORDERS)}\n"
+        )
+    return order(items, config.stash[durations_key])
+
+
+def _run_test_loop(items, session):
+    max_tasks = get_max_tasks(session.config)
+    items = order_items(items, session.config)
+
+    scheduler_name = session.config.getoption(
+        "--asyncio-scheduler"
+    ) or session.config.getini("asyncio_scheduler")
+    try:
+        scheduler = SCHEDULERS[scheduler_name]
+    except KeyError:
+        raise Exception(
+            f"Unknown asyncio scheduler '{scheduler_name}'.\n"
+            f"Choose one of: {', '.join(SCHEDULERS)}\n"
+        )
+    if scheduler is run_tests and is_adaptive(session.config):
+        raise Exception(
+            "--max-asyncio-tasks=auto is only supported by the 'queue' asyncio "
+            "scheduler\n"
         )
+    if scheduler is run_tests and any(item._resources for item in items):
+        raise Exception(
+            "asyncio resource limits are only supported by the 'queue' asyncio "
+            "scheduler\n"
+        )
+
+    loop = new_event_loop(session.config)
+    try:
+        loop.run_until_complete(scheduler(items, int(max_tasks), session))
     finally:
         loop.close()
 
 
+def _run_items(items, session):
+    session.config.stash[scope_lifetimes_key] = ScopeLifetimes(items)
+    _run_test_loop(items, session)
+
+
+def get_sync_executor(config) -> str:
+    sync_executor = config.getoption("--asyncio-sync-executor") or config.getini(
+        "asyncio_sync_executor"
+    )
+    if sync_executor not in ["inline", "thread"]:
+        raise Exception(
+            f"Unknown asyncio sync executor '{sync_executor}'.\n"
+            f"Choose one of: inline, thread\n"
+        )
+    return sync_executor
+
+
+def prepare_item(item) -> bool:
+    """Returns True if the item should be run cooperatively"""
+    markers = {m.name: m for m in item.own_markers}
+
+    if "skip" in markers or "skipif" in markers:
+        # Best to hand off to the core pytest logic to handle this so reporting works
+        if isinstance(evaluate_skip_marks(item), Skip):
+            return False
+
+    marker = markers.get("asyncio_cooperative") or markers.get("cooperative_thread")
+    if marker is None:
+        return False
+
+    flakey = markers.get("flakey")
+    item._flakey = flakey is not None
+    item._retries = flakey.kwargs.get("retries", 1) if flakey else 0
+    item._backoff = flakey.kwargs.get("backoff", 0) if flakey else 0
+    item._attempts = 1
+    item._timeout = marker.kwargs.get("timeout")
+    item._resources = marker.kwargs.get("resources") or {}
+    check_resources(item, item.config.stash[resource_limits_key])
+    item._in_thread = "cooperative_thread" in markers or (
+        get_sync_executor(item.config) == "thread"
+    )
+    return True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    # Under pytest-xdist the worker hands us items one at a time
+    runner = item.config.stash.get(xdist_runner_key, None)
+    if runner is None or getattr(item, "_asyncio_claimed", False):
+        return None
+
+    if not prepare_item(item):
+        runner.defer(item)
+        return True
+
+    activate_assert_rewrite(item)
+    runner.claim(item)
+    return True
+
+
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_runtestloop(session):
     if session.config.pluginmanager.is_registered("asyncio"):
@@ -282,31 +940,41 @@ def pytest_runtestloop(session):
     # which use the pytest_runtestloop hook.
     previous_collectonly = session.config.option.collectonly
     session.config.option.collectonly = True
+
+    # pytest-xdist workers run their own loop over the items they are given
+    runner = None
+    if is_xdist_worker(session.config) and not previous_collectonly:
+        runner = XdistWorkerRunner(
+            session.config,
+            functools.partial(new_event_loop, session.config),
+            functools.partial(new_scheduler, session),
+            functools.partial(report_completed, session=session),
+        )
+        session.config.stash[xdist_runner_key] = runner
+        session.config.stash[scope_lifetimes_key] = ScopeLifetimes()
+        session.config.pluginmanager.register(runner, "asyncio-cooperative-xdist")
+
     yield
     session.config.option.collectonly = previous_collectonly
 
     session.wrapped_fixtures = {}
 
-    # Collect our coroutines
+    if runner is not None:
+        del session.config.stash[xdist_runner_key]
+        if runner.items:
+            activate_assert_rewrite(runner.items[0])
+        try:
+            runner.finish()
+        finally:
+            session.config.pluginmanager.unregister(runner)
+        return True
+
+    # Collect our tests
     regular_items = []
-    item_by_coro = {}
-    tasks = []
+    items = []
     for item in session.items:
-        markers = {m.name: m for m in item.own_markers}
-
-        if "skip" in markers or "skipif" in markers:
-            # Best to hand off to the core pytest logic to handle this so reporting works
-            if isinstance(evaluate_skip_marks(item), Skip):
-                regular_items.append(item)
-                continue
-
-        # Coerce into a task
-        if "asyncio_cooperative" in markers:
-            task = item_to_task(item)
-
-            item._flakey = "flakey" in markers
-            item_by_coro[task] = item
-            tasks.append(task)
+        if prepare_item(item):
+            items.append(item)
         else:
             regular_items.append(item)
 
@@ -314,28 +982,35 @@ def pytest_runtestloop(session):
     # Hack: pytest's implementation sets up assert rewriting as a shared
     # resource. This causes a race condition between async tests. Therefore we
     # need to activate the assert rewriting here
-    if tasks:
-        item = item_by_coro[tasks[0]]
-        activate_assert_rewrite(item)
+    if items:
+        activate_assert_rewrite(items[0])
 
     if previous_collectonly:
         return
 
     # Run the tests using cooperative multitasking
-    flakes_to_retry = _run_test_loop(tasks, session, item_by_coro)
-
-    # Run failed flakey tests
-    if flakes_to_retry:
-        _run_test_loop(flakes_to_retry, session, item_by_coro)
+    num_workers = int(
+        session.config.getoption("--asyncio-workers")
+        or session.config.getini("asyncio_workers")
+    )
+    if num_workers > 1 and items:
+        expected_durations = session.config.stash[durations_key].estimate(items)
+        run_workers(
+            session,
+            items,
+            expected_durations,
+            num_workers,
+            functools.partial(_run_items, session=session),
+        )
+    else:
+        _run_items(items, session)
 
-    # Run synchronous tests
+    # Run synchronous tests, unless the cooperative ones were stopped
+    raise_if_stopping(session)
     session.items = regular_items
     for i, item in enumerate(session.items):
         nextitem = session.items[i + 1] if i + 1 < len(session.items) else None
         item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
-        if session.shouldfail:
-            raise session.Failed(session.shouldfail)
-        if session.shouldstop:
-            raise session.Interrupted(session.shouldstop)
+        raise_if_stopping(session)
 
     return True
@@ -0,0 +1,121 @@
+import asyncio
+import collections
+import functools
+import inspect
+
+import pytest
+
+
+class Pool:
+    """Up to `size` resources made by a fixture function, each leased to one
+    test at a time.
+
+    Stands in for the fixture function so pytest still sees its name and
+    arguments. Resources are only made when a test asks for one and none are
+    idle, and are torn down together by `close` at the end of the fixture's
+    scope."""
+
+    def __init__(self, factory, size: int):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+
+        self.factory = factory
+        self.size = size
+        self.idle = collections.deque()
+        self.teardowns = []
+        functools.update_wrapper(self, factory)
+
+    @property
+    def __code__(self):
+        return self.factory.__code__
+
+    def __call__(self, *args, **kwargs):
+        raise Exception(
+            f"Fixture '{self.__name__}' is pooled, it can only be used by tests "
+            "marked with asyncio_cooperative"
+        )
+
+    @property
+    def available(self):
+        # Created on first use so it belongs to the loop the tests run on
+        try:
+            return self._available
+        except AttributeError:
+            self._available = asyncio.Semaphore(self.size)
+            return self._available
+
+    async def lease(self, *args):
+        """Async generator which yields a resource for a test to use on its own
+        and puts it back in the pool once resumed"""
+        await self.available.acquire()
+        try:
+            resource = self.idle.popleft() if self.idle else await self._make(args)
+        except BaseException:
+            self.available.release()
+            raise
+
+        try:
+            yield resource
+        finally:
+            self.idle.append(resource)
+            self.available.release()
+
+    async def _make(self, args):
+        if inspect.isasyncgenfunction(self.factory):
+            gen = self.factory(*args)
+            resource = await gen.__anext__()
+        elif inspect.isgeneratorfunction(self.factory):
+            gen = self.factory(*args)
+            resource = gen.__next__()
+        else:
+            gen = None
+            resource = self.factory(*args)
+            if inspect.isawaitable(resource):
+                resource = await resource
+
+        self.teardowns.append(gen)
+        return resource
+
+    async def close(self):
+        """Tear down every resource the pool made, most recent first"""
+        teardowns, self.teardowns = self.teardowns, []
+        self.idle.clear()
+
+        errors = []
+        for gen in reversed(teardowns):
+            if gen is None:
+                continue
+            try:
+                if inspect.isasyncgen(gen):
+                    await gen.__anext__()
+                else:
+                    gen.__next__()
+            except (StopIteration, StopAsyncIteration):
+                pass
+            except Exception as e:
+                errors.append(e)
+            else:
+                errors.append(
+                    Exception(f"Fixture '{self.__name__}' has more than one yield")
+                )
+
+        if errors:
+            raise errors[0]
+
+
+def cooperative_pool(size: int, scope: str = "session", **kwargs):
+    """Decorate a fixture function so each cooperative test using the fixture
+    gets one of at most `size` resources to itself.
+
+    Resources are shared between the tests of the fixture's scope ('module' or
+    'session') and are torn down at the end of it. Other arguments are passed
+    on to `pytest.fixture`."""
+    if scope not in ["module", "session"]:
+        raise ValueError(
+            f"Pooled fixtures must be module or session scoped, got '{scope}'"
+        )
+
+    def decorator(factory):
+        return pytest.fixture(scope=scope, **kwargs)(Pool(factory, size))
+
+    return decorator
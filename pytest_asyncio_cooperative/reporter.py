@@ -0,0 +1,63 @@
+import queue
+import threading
+
+
+class InlineReporter:
+    """Run the reporting hooks for a finished test on the event loop thread."""
+
+    def __init__(self, report):
+        self.report = report
+
+    def submit(self, item, result):
+        self.report(item, result)
+
+    def close(self):
+        pass
+
+
+class ThreadedReporter:
+    """Hand finished tests to a dedicated thread which runs the reporting hooks.
+
+    Tests are reported one at a time in the order they were submitted, so hook
+    ordering is the same as with the inline reporter. The event loop keeps
+    running the other tests while a report is being made."""
+
+    def __init__(self, report):
+        self.report = report
+        self.queue = queue.Queue()
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._run, name="asyncio-cooperative-reporter", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, item, result):
+        self.queue.put((item, result))
+
+    def _run(self):
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                return
+
+            # Stop reporting after the first error, it is raised by close()
+            if self.error is not None:
+                continue
+
+            try:
+                self.report(*entry)
+            except BaseException as e:
+                self.error = e
+
+    def close(self):
+        # All tests have finished, wait for the remaining reports
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+REPORTERS = {
+    "inline": InlineReporter,
+    "thread": ThreadedReporter,
+}
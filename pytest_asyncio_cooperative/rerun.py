@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+
+class RerunExecutor:
+    """Run tests again when pytest (or a retry plugin) calls `item.runtest`
+    after the test has already been run cooperatively.
+
+    We can't block for an async function in the same thread as the running
+    event loop, nor can we nest event loops, so reruns are sent to one
+    long-lived thread which owns its own event loop. The thread is started on
+    the first rerun and reused for the rest of the session."""
+
+    def __init__(self, loop_factory=asyncio.new_event_loop):
+        self.loop_factory = loop_factory
+        self.calls = 0
+        self.loop = None
+        self.thread = None
+
+    def _start(self):
+        self.loop = self.loop_factory()
+
+        def run_forever():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(
+            target=run_forever, name="asyncio-cooperative-rerun", daemon=True
+        )
+        self.thread.start()
+
+    def run(self, coro):
+        self.calls += 1
+        if self.thread is None:
+            self._start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        if self.thread is None:
+            return
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        try:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        finally:
+            self.loop.close()
+            self.loop = None
+            self.thread = None
@@ -0,0 +1,59 @@
+import collections
+from typing import Dict
+from typing import List
+
+import pytest
+
+resource_limits_key = pytest.StashKey[Dict[str, int]]()
+
+
+def parse_resource_limits(values: List[str]) -> Dict[str, int]:
+    """Parse `name:limit` pairs, eg. ["db:10", "s3:50"]"""
+    limits = {}
+    for value in values:
+        name, sep, limit = value.partition(":")
+        if not name or not sep or not limit.isdigit() or int(limit) < 1:
+            raise Exception(
+                f"Invalid asyncio resource limit '{value}'.\n"
+                "Expected name:limit, eg. db:10\n"
+            )
+        limits[name] = int(limit)
+    return limits
+
+
+def check_resources(item, limits: Dict[str, int]):
+    """Raise if the item uses a resource without a limit, or more of one than
+    could ever be available"""
+    for name, count in item._resources.items():
+        if name not in limits:
+            raise Exception(
+                f"Unknown asyncio resource '{name}' used by {item.nodeid}.\n"
+                "Declare its limit with asyncio_resource_limits, eg. "
+                f"{name}:10\n"
+            )
+        if count > limits[name]:
+            raise Exception(
+                f"{item.nodeid} uses {count} of asyncio resource '{name}' but its "
+                f"limit is {limits[name]}\n"
+            )
+
+
+class ResourceLimits:
+    """How much of each limited resource the running tests are using"""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self.in_use = collections.Counter()
+
+    def acquire(self, resources: Dict[str, int]) -> bool:
+        """Take the resources if all of them are available"""
+        if any(
+            self.in_use[name] + count > self.limits[name]
+            for name, count in resources.items()
+        ):
+            return False
+        self.in_use.update(resources)
+        return True
+
+    def release(self, resources: Dict[str, int]):
+        self.in_use.subtract(resources)
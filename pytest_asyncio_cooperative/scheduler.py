@@ -0,0 +1,177 @@
+import asyncio
+import collections
+import functools
+from sys import version_info as sys_version_info
+
+
+def cancel_task(task, now, item):
+    if sys_version_info >= (3, 9):
+        msg = "Test took too long ({:.2f} s)".format(now - item.enqueue_time)
+        task.cancel(msg=msg)
+    else:
+        task.cancel()
+
+
+def get_item_timeout(item, default):
+    # Tests can override the session timeout with the marker's timeout argument
+    timeout = getattr(item, "_timeout", None)
+    return default if timeout is None else timeout
+
+
+class Scheduler:
+    """Run tests as tasks with at most `max_tasks` running at once.
+
+    Pending items wait in a deque and `make_coro` is only called for an item
+    once it is admitted. Each task gets a done callback which frees its slot,
+    refills every free slot from the deque and queues the finished task for
+    the consumer. Iterating the scheduler yields `(item, task)` pairs in order
+    of completion until the scheduler is closed and every task, including
+    retries, has finished.
+
+    With a `concurrency` controller, `max_tasks` is adjusted after each task
+    finishes.
+
+    Items which use limited `resources` are only admitted once every resource
+    they use is available. Until then they wait, grouped by the resources they
+    use, without taking a slot, so items after them can still be admitted."""
+
+    def __init__(
+        self,
+        max_tasks: int,
+        task_timeout: float,
+        make_coro,
+        concurrency=None,
+        resources=None,
+    ):
+        self.max_tasks = max_tasks
+        self.concurrency = concurrency
+        self.resources = resources
+        self.task_timeout = task_timeout
+        self.make_coro = make_coro
+        self.pending = collections.deque()
+        self.waiting = {}
+        self.running = 0
+        self.loop = asyncio.get_running_loop()
+        self.completed = asyncio.Queue()
+        self.closed = False
+        self.admitted = None
+        self.retrying = {}
+        self.running_items = {}
+        self.interrupted = None
+
+    def push(self, item):
+        if self.interrupted is not None:
+            return
+        self.pending.append(item)
+        self._fill()
+
+    def retry(self, item, delay: float):
+        """Push the item again after `delay` seconds"""
+        handle = self.loop.call_later(delay, lambda: self._retry(item, handle))
+        self.retrying[handle] = item
+
+    def _retry(self, item, handle):
+        del self.retrying[handle]
+        self.push(item)
+
+    def interrupt(self, reason: str):
+        """Stop admitting items and cancel the running ones. Their fixtures are
+        still torn down."""
+        if self.interrupted is not None:
+            return
+        self.interrupted = reason
+        self.pending.clear()
+        self.waiting.clear()
+        # Retries waiting out their backoff are reported as interrupted
+        for handle, item in self.retrying.items():
+            handle.cancel()
+            item._asyncio_interrupted = reason
+            cancelled = self.loop.create_future()
+            cancelled.cancel()
+            self.completed.put_nowait((item, cancelled))
+        self.retrying.clear()
+        for task, item in self.running_items.items():
+            item._asyncio_interrupted = reason
+            task.cancel()
+        if self.admitted and not self.admitted.done():
+            self.admitted.set_result(None)
+
+    def close(self):
+        """No more items will be pushed"""
+        self.closed = True
+        # Wake up the consumer in case it is waiting on an idle scheduler
+        self.completed.put_nowait(None)
+
+    async def wait_for_admission(self):
+        """Wait until every pushed item has been admitted into a slot"""
+        while self.pending:
+            self.admitted = self.loop.create_future()
+            await self.admitted
+
+    def _fill(self):
+        # Items waiting for resources were pushed first so get the first chance
+        for key, waiting in list(self.waiting.items()):
+            # Items in a group use the same resources so only the first is tried
+            while (
+                waiting
+                and self.running < self.max_tasks
+                and self.resources.acquire(waiting[0]._resources)
+            ):
+                self._start(waiting.popleft())
+            if not waiting:
+                del self.waiting[key]
+
+        while self.pending and self.running < self.max_tasks:
+            item = self.pending.popleft()
+            resources = getattr(item, "_resources", None)
+            if not resources or self.resources.acquire(resources):
+                self._start(item)
+            else:
+                key = tuple(sorted(resources.items()))
+                self.waiting.setdefault(key, collections.deque()).append(item)
+
+    def _start(self, item):
+        item.enqueue_time = self.loop.time()
+        task = self.loop.create_task(self.make_coro(item))
+        timeout_handle = self.loop.call_later(
+            get_item_timeout(item, self.task_timeout), self._timeout, task, item
+        )
+        task.add_done_callback(functools.partial(self._done, item, timeout_handle))
+        self.running += 1
+        self.running_items[task] = item
+
+    def _timeout(self, task, item):
+        cancel_task(task, self.loop.time(), item)
+
+    def _done(self, item, timeout_handle, task):
+        timeout_handle.cancel()
+        self.running -= 1
+        del self.running_items[task]
+        if getattr(item, "_resources", None):
+            self.resources.release(item._resources)
+        if self.concurrency is not None:
+            failed = task.cancelled() or task.exception() is not None
+            latency = self.loop.time() - item.enqueue_time
+            self.max_tasks = self.concurrency.observe(latency, failed)
+        self.completed.put_nowait((item, task))
+        self._fill()
+        if self.admitted and not self.admitted.done():
+            self.admitted.set_result(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            if (
+                self.closed
+                and not self.running
+                and not self.pending
+                and not self.waiting
+                and not self.retrying
+                and self.completed.empty()
+            ):
+                raise StopAsyncIteration
+            completed = await self.completed.get()
+            if completed is not None:
+                return completed
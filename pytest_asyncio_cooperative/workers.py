@@ -0,0 +1,149 @@
+import heapq
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+from typing import Tuple
+
+import pytest
+
+worker_position_key = pytest.StashKey[Tuple[int, int]]()
+
+
+def worker_position(config) -> Tuple[int, int]:
+    """Index of this process among all the processes running cooperative tests
+    (pytest-xdist workers and --asyncio-workers), and how many there are"""
+    index, count = config.stash.get(worker_position_key, (0, 1))
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        xdist_index = int(workerinput["workerid"].lstrip("gw"))
+        index += xdist_index * count
+        count *= workerinput["workercount"]
+
+    return index, count
+
+
+def shard_items(items, expected_durations, num_shards: int):
+    """Split items into shards of roughly equal expected duration.
+
+    Longest items are placed first onto whichever shard has the least work.
+    Each shard keeps its items in collection order."""
+    loads = [(0.0, i) for i in range(num_shards)]
+    assigned = [[] for _ in range(num_shards)]
+    by_duration = sorted(
+        range(len(items)), key=lambda i: expected_durations[i], reverse=True
+    )
+    for i in by_duration:
+        load, shard = heapq.heappop(loads)
+        assigned[shard].append(i)
+        heapq.heappush(loads, (load + expected_durations[i], shard))
+    return [[items[i] for i in sorted(indexes)] for indexes in assigned]
+
+
+class WorkerReportSender:
+    """Registered in worker processes to send reports to the parent process"""
+
+    def __init__(self, config, conn):
+        self.config = config
+        self.conn = conn
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.conn.send(("logstart", {"nodeid": nodeid, "location": location}))
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(
+            config=self.config, report=report
+        )
+        self.conn.send(("logreport", {"report": data}))
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.conn.send(("logfinish", {"nodeid": nodeid, "location": location}))
+
+
+def _worker_main(session, position, items, conn, run_items):
+    config = session.config
+    config.stash[worker_position_key] = position
+
+    # The parent process does all of the terminal output
+    terminal_reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if terminal_reporter:
+        config.pluginmanager.unregister(terminal_reporter)
+    config.pluginmanager.register(
+        WorkerReportSender(config, conn), "asyncio-cooperative-worker"
+    )
+
+    # The parent process signals once pytest should stop, eg. when another
+    # worker's failures reach --maxfail
+    def stop(signum, frame):
+        if not session.shouldfail and not session.shouldstop:
+            session.shouldstop = "stopping in another worker"
+
+    signal.signal(signal.SIGUSR1, stop)
+
+    try:
+        run_items(items)
+    finally:
+        conn.send(None)
+        conn.close()
+
+
+def run_workers(session, items, expected_durations, num_workers: int, run_items):
+    """Fork worker processes which each run a shard of items on their own
+    event loop with `run_items`. Reports are streamed back to this process and
+    replayed through the reporting hooks."""
+    config = session.config
+
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        raise Exception("--asyncio-workers requires a platform which supports fork")
+
+    workers = []
+    shards = shard_items(items, expected_durations, num_workers)
+    for index, shard in enumerate(shards):
+        if not shard:
+            continue
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_worker_main,
+            args=(session, (index, num_workers), shard, writer, run_items),
+            daemon=True,
+        )
+        process.start()
+        writer.close()
+        workers.append((process, reader))
+
+    conns = [reader for _, reader in workers]
+    stopping = False
+    while conns:
+        for conn in multiprocessing.connection.wait(conns):
+            try:
+                message = conn.recv()
+            except EOFError:
+                message = None
+
+            if message is None:
+                conns.remove(conn)
+                continue
+
+            name, kwargs = message
+            if name == "logreport":
+                kwargs["report"] = config.hook.pytest_report_from_serializable(
+                    config=config, data=kwargs["report"]
+                )
+            getattr(config.hook, f"pytest_runtest_{name}")(**kwargs)
+
+            if not stopping and (session.shouldfail or session.shouldstop):
+                stopping = True
+                for process, _ in workers:
+                    if process.is_alive():
+                        os.kill(process.pid, signal.SIGUSR1)
+
+    for process, reader in workers:
+        process.join()
+        reader.close()
+        if process.exitcode != 0:
+            raise Exception(
+                f"asyncio worker {process.pid} exited with code {process.exitcode}"
+            )
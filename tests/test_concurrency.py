@@ -0,0 +1,94 @@
+import json
+
+from pytest_asyncio_cooperative.concurrency import AdaptiveConcurrency
+
+
+def test_adaptive_concurrency():
+    concurrency = AdaptiveConcurrency()
+
+    # Slow start doubles the limit while latency stays flat
+    for _ in range(8 + 16):
+        limit = concurrency.observe(1.0, False)
+    assert limit == 32
+
+    # Latency climbing backs off
+    for _ in range(32):
+        limit = concurrency.observe(2.0, False)
+    assert limit == 24
+
+    # Then grows by one at a time
+    for _ in range(24):
+        limit = concurrency.observe(1.0, False)
+    assert limit == 25
+
+    # Errors climbing backs off too
+    for i in range(25):
+        limit = concurrency.observe(1.0, i % 2 == 0)
+    assert limit == 18
+
+    assert [entry["action"] for entry in concurrency.log] == [
+        "increase",
+        "increase",
+        "decrease (latency)",
+        "increase",
+        "decrease (errors)",
+    ]
+
+
+def test_max_asyncio_tasks_auto(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        active = 0
+        peak = 0
+
+
+        @pytest.mark.parametrize("x", range(300))
+        @pytest.mark.asyncio_cooperative
+        async def test_service(x):
+            global active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                # A service which slows down beyond 16 requests at once
+                await asyncio.sleep(0.01 * max(1, active / 16))
+            finally:
+                active -= 1
+
+
+        def test_peak():
+            assert 16 <= peak < 64
+    """
+    )
+
+    result = testdir.runpytest(
+        "--max-asyncio-tasks=auto", "--asyncio-concurrency-log=concurrency.json"
+    )
+
+    result.assert_outcomes(passed=301)
+    with open(testdir.tmpdir / "concurrency.json") as f:
+        log = json.load(f)
+    assert log[0]["limit"] == AdaptiveConcurrency.initial_limit
+    assert "decrease (latency)" in [entry["action"] for entry in log]
+
+
+def test_max_asyncio_tasks_auto_legacy_scheduler(testdir):
+    testdir.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=auto", "--asyncio-scheduler=legacy")
+
+    result.stdout.fnmatch_lines(["*only supported by the 'queue' asyncio scheduler*"])
@@ -1,3 +1,7 @@
+import itertools
+import re
+import time
+
 import pytest
 
 
@@ -32,3 +36,96 @@ def test_function_takes_too_long(testdir, dur1, dur2, expectedfails, expectedpas
     result = testdir.runpytest("--asyncio-task-timeout", "1")
 
     result.assert_outcomes(failed=expectedfails, passed=expectedpasses)
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_marker_timeout_overrides_task_timeout(testdir, scheduler):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative(timeout=0.5)
+        async def test_a():
+            await asyncio.sleep(3)
+
+        @pytest.mark.asyncio_cooperative(timeout=3)
+        async def test_b():
+            await asyncio.sleep(1.5)
+    """
+    )
+
+    result = testdir.runpytest(
+        "--asyncio-task-timeout", "1", f"--asyncio-scheduler={scheduler}"
+    )
+
+    result.assert_outcomes(failed=1, passed=1)
+    assert result.duration < 2.5
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_timeout_is_prompt(testdir, scheduler):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            await asyncio.sleep(10)
+    """
+    )
+
+    result = testdir.runpytest(
+        "--asyncio-task-timeout", "1", f"--asyncio-scheduler={scheduler}"
+    )
+
+    result.assert_outcomes(failed=1)
+    assert result.duration < 2
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_timeout_unaffected_by_clock_jumps(testdir, monkeypatch, scheduler):
+    testdir.makeconftest("""""")
+
+    # As if the system clock is adjusted by a minute between every reading
+    wall_clock = time.time
+    offsets = itertools.count(60, 60)
+    monkeypatch.setattr(time, "time", lambda: wall_clock() + next(offsets))
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            await asyncio.sleep(0.5)
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            await asyncio.sleep(3)
+    """
+    )
+
+    result = testdir.runpytest(
+        "--asyncio-task-timeout",
+        "1",
+        f"--asyncio-scheduler={scheduler}",
+        "--junitxml=junit.xml",
+    )
+
+    result.assert_outcomes(failed=1, passed=1)
+    result.stdout.fnmatch_lines(["*test_b*"])
+    with open(testdir.tmpdir / "junit.xml") as f:
+        times = [
+            float(t) for t in re.findall(r'<testcase [^>]*time="([\d.]+)"', f.read())
+        ]
+    assert times and all(t < 1.5 for t in times)
@@ -500,12 +500,9 @@ def test_shared_fixture_caching(testdir, scope, def_, ret, fail):
     result = testdir.runpytest()
 
     if fail:
-        if ret == "yield" and def_ == "def":
-            result.assert_outcomes(errors=2)
-        else:
-            result.assert_outcomes(failed=2)
-        # Should be errors instead of failures
+        # Fixtures which fail to set up are reported as errors
         # https://github.com/willemt/pytest-asyncio-cooperative/issues/42
+        result.assert_outcomes(errors=2)
     else:
         result.assert_outcomes(passed=2)
 
@@ -690,4 +687,4 @@ def test_fixture_nested_exception(testdir):
     )
 
     result = testdir.runpytest()
-    result.assert_outcomes(errors=0, failed=1)
+    result.assert_outcomes(errors=1, failed=0)
@@ -0,0 +1,89 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+TEST_MODULE = """
+    import asyncio
+
+    import pytest
+
+
+    @pytest.fixture
+    async def slow_setup():
+        await asyncio.sleep(0.3)
+        return 1
+
+
+    @pytest.fixture
+    async def slow_teardown():
+        yield
+        await asyncio.sleep(0.2)
+
+
+    @pytest.fixture
+    def fast():
+        return 1
+
+
+    @pytest.mark.asyncio_cooperative
+    async def test_a(slow_setup, slow_teardown, fast):
+        pass
+"""
+
+
+@pytest.mark.parametrize("ini", [False, True])
+def test_fixture_durations(testdir, ini):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    if ini:
+        testdir.makeini(
+            """
+            [pytest]
+            asyncio_fixture_durations = 5
+        """
+        )
+        result = testdir.runpytest()
+    else:
+        result = testdir.runpytest("--asyncio-fixture-durations=5")
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*slowest 5 asyncio fixture durations*",
+            "0.3?s setup    test_fixture_durations.py::test_a::slow_setup",
+            "0.2?s teardown test_fixture_durations.py::test_a::slow_teardown",
+            "*durations < 0.005s hidden*",
+        ]
+    )
+    result.stdout.no_fnmatch_line("*::fast")
+
+
+def test_fixture_durations_disabled(testdir):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=1)
+    result.stdout.no_fnmatch_line("*asyncio fixture durations*")
+
+
+def test_fixture_durations_junitxml(testdir):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    result = testdir.runpytest(
+        "--asyncio-fixture-durations=0", "--junitxml=junit.xml", "-vv"
+    )
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*test_a::fast"])
+
+    testcase = ET.parse(str(testdir.tmpdir / "junit.xml")).find(".//testcase")
+    properties = {
+        prop.get("name"): float(prop.get("value")) for prop in testcase.iter("property")
+    }
+    assert properties["asyncio_fixture_setup:slow_setup"] >= 0.3
+    assert properties["asyncio_fixture_teardown:slow_teardown"] >= 0.2
+    assert "asyncio_fixture_teardown:fast" not in properties
@@ -0,0 +1,369 @@
+import json
+
+import pytest
+
+
+def test_dependencies_set_up_concurrently(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture
+        async def first():
+            await asyncio.sleep(0.5)
+            return 1
+
+
+        @pytest.fixture
+        async def second():
+            await asyncio.sleep(0.5)
+            yield 2
+
+
+        @pytest.fixture
+        async def third():
+            await asyncio.sleep(0.5)
+            return 3
+
+
+        @pytest.fixture
+        async def combined(first, second, third):
+            return first + second + third
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(combined):
+            assert combined == 6
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=1)
+    assert result.duration < 1.2
+
+
+def test_fixture_setup_stays_in_one_task(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import sys
+
+        import pytest
+
+
+        @pytest.fixture
+        async def same_task():
+            before = asyncio.current_task()
+            await asyncio.sleep(0.01)
+            return before is asyncio.current_task()
+
+
+        @pytest.fixture
+        async def timeout():
+            async with asyncio.timeout(1):
+                await asyncio.sleep(0.01)
+            return True
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(same_task):
+            assert same_task
+
+
+        @pytest.mark.skipif(sys.version_info < (3, 11), reason="Requires asyncio.timeout")
+        @pytest.mark.asyncio_cooperative
+        async def test_timeout(timeout):
+            assert timeout
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=2)
+
+
+def test_shared_dependency_set_up_once(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        events = []
+
+
+        @pytest.fixture
+        async def base():
+            events.append("base setup")
+            await asyncio.sleep(0.1)
+            yield "base"
+            events.append("base teardown")
+
+
+        @pytest.fixture
+        async def left(base):
+            await asyncio.sleep(0.1)
+            yield base + " left"
+            events.append("left teardown")
+
+
+        @pytest.fixture
+        async def right(base):
+            yield base + " right"
+            events.append("right teardown")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(left, right, base):
+            assert left == "base left"
+            assert right == "base right"
+
+
+        def test_events():
+            assert events[0] == "base setup"
+            assert events[-1] == "base teardown"
+            assert sorted(events[1:-1]) == ["left teardown", "right teardown"]
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=2)
+
+
+def test_fixture_graph(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture(scope="module")
+        async def database():
+            await asyncio.sleep(0.2)
+            return "database"
+
+
+        @pytest.fixture
+        async def user(database, request):
+            await asyncio.sleep(0.1)
+            return "user"
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(user):
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-fixture-graph=graph.json")
+
+    result.assert_outcomes(passed=1)
+    with open(testdir.tmpdir / "graph.json") as f:
+        graphs = json.load(f)
+
+    graph = graphs["test_fixture_graph.py::test_a"]
+    assert graph["database"]["scope"] == "module"
+    assert graph["database"]["depends_on"] == []
+    assert graph["database"]["duration"] >= 0.2
+    assert graph["user"]["depends_on"] == ["database", "request"]
+    assert graph["user"]["duration"] >= 0.1
+    assert graph["user"]["start"] >= graph["database"]["duration"]
+
+
+def test_independent_fixtures_torn_down_concurrently(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture
+        async def first():
+            yield
+            await asyncio.sleep(0.5)
+
+
+        @pytest.fixture
+        async def second():
+            yield
+            await asyncio.sleep(0.5)
+
+
+        @pytest.fixture
+        def third():
+            yield
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(first, second, third):
+            pass
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=1)
+    assert result.duration < 0.9
+
+
+def test_teardown_in_reverse_dependency_order(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        events = []
+
+
+        @pytest.fixture
+        async def base():
+            yield
+            events.append("base teardown")
+
+
+        @pytest.fixture
+        async def slow(base):
+            yield
+            await asyncio.sleep(0.2)
+            events.append("slow teardown")
+
+
+        @pytest.fixture
+        async def fast(base):
+            yield
+            events.append("fast teardown")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(slow, fast):
+            pass
+
+
+        def test_events():
+            assert events == ["fast teardown", "slow teardown", "base teardown"]
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=2)
+
+
+def test_teardown_errors_reported_together(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import pytest
+
+        events = []
+
+
+        @pytest.fixture
+        async def base():
+            yield
+            events.append("base teardown")
+
+
+        @pytest.fixture
+        async def left(base):
+            yield
+            raise Exception("left failed")
+
+
+        @pytest.fixture
+        def right(base):
+            yield
+            raise Exception("right failed")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(left, right):
+            pass
+
+
+        def test_events():
+            assert events == ["base teardown"]
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*2 fixtures failed to tear down*",
+            "*Fixture 'right':*",
+            "*right failed*",
+            "*Fixture 'left':*",
+            "*left failed*",
+        ]
+    )
+
+
+@pytest.mark.parametrize("option", ["--asyncio-teardown=sequential", None])
+def test_sequential_teardown(testdir, option):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        events = []
+
+
+        @pytest.fixture
+        async def first():
+            yield
+            events.append("first teardown")
+
+
+        @pytest.fixture
+        async def second():
+            yield
+            await asyncio.sleep(0.2)
+            events.append("second teardown")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(first, second):
+            pass
+
+
+        def test_events():
+            assert events == ["second teardown", "first teardown"]
+    """
+    )
+    if option is None:
+        testdir.makeini(
+            """
+            [pytest]
+            asyncio_teardown = sequential
+        """
+        )
+
+    result = testdir.runpytest(*([option] if option else []))
+
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,154 @@
+import pytest
+
+
+@pytest.mark.parametrize("fixture_def", ["def", "async def"])
+def test_module_fixture_lasts_until_last_test(testdir, fixture_def):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        f"""
+        import asyncio
+
+        import pytest
+
+        events = []
+
+
+        @pytest.fixture(scope="module")
+        {fixture_def} connection():
+            state = {{"open": True}}
+            events.append("setup")
+            yield state
+            state["open"] = False
+            events.append("teardown")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(connection):
+            await asyncio.sleep(0.1)
+            assert connection["open"]
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            await asyncio.sleep(0.1)
+            assert events == ["setup"]
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_c(connection):
+            await asyncio.sleep(0.1)
+            assert connection["open"]
+
+
+        def test_events():
+            assert events == ["setup", "teardown"]
+    """
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=1")
+
+    result.assert_outcomes(passed=4)
+
+
+@pytest.mark.parametrize("fixture_def", ["def", "async def"])
+def test_module_fixture_released_with_module(testdir, fixture_def):
+    testdir.makeconftest(
+        f"""
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        {fixture_def} session_resource():
+            with open("events.txt", "a") as f:
+                f.write("session setup\\n")
+            yield
+            with open("events.txt", "a") as f:
+                f.write("session teardown\\n")
+    """
+    )
+
+    testdir.makepyfile(
+        test_first=f"""
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture(scope="module")
+        {fixture_def} module_resource(session_resource):
+            with open("events.txt", "a") as f:
+                f.write("module setup\\n")
+            yield
+            with open("events.txt", "a") as f:
+                f.write("module teardown\\n")
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative
+        async def test_first(x, module_resource):
+            await asyncio.sleep(0.1)
+    """,
+        test_second="""
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative
+        async def test_second(x, session_resource):
+            with open("events.txt", "a") as f:
+                f.write("test_second\\n")
+            await asyncio.sleep(0.1)
+    """,
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=1")
+
+    result.assert_outcomes(passed=6)
+    with open(testdir.tmpdir / "events.txt") as f:
+        events = f.read().splitlines()
+    assert events == [
+        "session setup",
+        "module setup",
+        "module teardown",
+        "test_second",
+        "test_second",
+        "test_second",
+        "session teardown",
+    ]
+
+
+def test_module_fixture_teardown_error(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture(scope="module")
+        async def broken():
+            yield
+            raise Exception("teardown failed")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(broken):
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b(broken):
+            await asyncio.sleep(0.1)
+    """
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=1")
+
+    # The last test using the fixture reports the error
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*test_b*", "*teardown failed*"])
@@ -174,25 +174,25 @@ def test_async_generator_function_with_sibling_and_another_test(testdir):
 
     result = testdir.runpytest()
 
-    expected_lines = [
-        "outer: setup test_async",
-        "middle_sibling: setup test_async",
-        "middle: setup test_async",
-        "outer: setup test_b",
-        "middle_sibling: setup test_b",
-        "middle: setup test_b",
-        "test_b",
-        "middle: cleanup test_b",
-        "middle_sibling: cleanup test_b",
-        "outer: cleanup test_b",
-        "test_async_generator_function_with_sibling_and_another_test.py .test_a",
-        "middle: cleanup test_async",
-        "middle_sibling: cleanup test_async",
-        "outer: cleanup test_async",
-    ]
-
     result = testdir.runpytest()
-    assert includes_lines_in_order(expected_lines, result.stdout.lines)
+
+    # The tests' fixtures are set up concurrently, so only each test's own
+    # setups are in order
+    for test in ["test_async", "test_b"]:
+        expected_lines = [
+            f"outer: setup {test}",
+            f"middle_sibling: setup {test}",
+            f"middle: setup {test}",
+            "test_b",
+            "middle: cleanup test_b",
+            "middle_sibling: cleanup test_b",
+            "outer: cleanup test_b",
+            "test_async_generator_function_with_sibling_and_another_test.py .test_a",
+            "middle: cleanup test_async",
+            "middle_sibling: cleanup test_async",
+            "outer: cleanup test_async",
+        ]
+        assert includes_lines_in_order(expected_lines, result.stdout.lines)
 
 
 def test_generator_function_with_sibling_and_another_test(testdir):
@@ -238,25 +238,25 @@ def test_generator_function_with_sibling_and_another_test(testdir):
 
     result = testdir.runpytest()
 
-    expected_lines = [
-        "outer: setup test_async",
-        "middle_sibling: setup test_async",
-        "middle: setup test_async",
-        "outer: setup test_b",
-        "middle_sibling: setup test_b",
-        "middle: setup test_b",
-        "test_b",
-        "middle: cleanup test_b",
-        "middle_sibling: cleanup test_b",
-        "outer: cleanup test_b",
-        "test_generator_function_with_sibling_and_another_test.py .test_a",
-        "middle: cleanup test_async",
-        "middle_sibling: cleanup test_async",
-        "outer: cleanup test_async",
-    ]
-
     result = testdir.runpytest()
-    assert includes_lines_in_order(expected_lines, result.stdout.lines)
+
+    # The tests' fixtures are set up concurrently, so only each test's own
+    # setups are in order
+    for test in ["test_async", "test_b"]:
+        expected_lines = [
+            f"outer: setup {test}",
+            f"middle_sibling: setup {test}",
+            f"middle: setup {test}",
+            "test_b",
+            "middle: cleanup test_b",
+            "middle_sibling: cleanup test_b",
+            "outer: cleanup test_b",
+            "test_generator_function_with_sibling_and_another_test.py .test_a",
+            "middle: cleanup test_async",
+            "middle_sibling: cleanup test_async",
+            "outer: cleanup test_async",
+        ]
+        assert includes_lines_in_order(expected_lines, result.stdout.lines)
 
 
 def test_session_scope_gen(testdir):
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_flakey_retries(testdir, scheduler):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        attempts = {"a": 0, "b": 0}
+
+
+        @pytest.mark.flakey(retries=3)
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            attempts["a"] += 1
+            await asyncio.sleep(0.1)
+            assert attempts["a"] == 3
+
+
+        @pytest.mark.flakey(retries=2)
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            attempts["b"] += 1
+            assert False
+
+
+        @pytest.mark.flakey
+        @pytest.mark.asyncio_cooperative
+        async def test_c():
+            pass
+
+
+        def test_attempts():
+            assert attempts == {"a": 3, "b": 3}
+    """
+    )
+
+    result = testdir.runpytest(f"--asyncio-scheduler={scheduler}")
+
+    result.assert_outcomes(passed=3, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*flakey tests*",
+            "2 retries, passed test_flakey_retries.py::test_a*",
+            "2 retries, failed test_flakey_retries.py::test_b*",
+            "2 flakey tests were retried 4 times, 1 still failed",
+        ]
+    )
+
+
+def test_flakey_retried_in_same_loop(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        loops = []
+
+
+        @pytest.mark.flakey(retries=1)
+        @pytest.mark.asyncio_cooperative
+        async def test_flakey():
+            loops.append(asyncio.get_running_loop())
+            assert len(loops) == 2
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_slow():
+            await asyncio.sleep(1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_same_loop():
+            await asyncio.sleep(0.5)
+            assert loops == [asyncio.get_running_loop()] * 2
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=3)
+    # The retry doesn't wait for every other test to finish first
+    assert result.duration < 1.5
+
+
+def test_flakey_backoff(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import time
+
+        import pytest
+
+        attempts = []
+
+
+        @pytest.mark.flakey(retries=2, backoff=0.2)
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            attempts.append(time.perf_counter())
+            assert len(attempts) == 3
+
+
+        def test_backoff():
+            first, second, third = attempts
+            assert second - first >= 0.2
+            assert third - second >= 0.4
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=2)
+
+
+def test_flake_history(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import os
+
+        import pytest
+
+        attempts = 0
+
+
+        @pytest.mark.flakey
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            global attempts
+            attempts += 1
+            assert attempts > 1 or os.environ.get("STABLE")
+    """
+    )
+
+    result = testdir.runpytest("-p", "cacheprovider")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["1 retries, passed *test_a (retried in 1 of 1 runs)"])
+
+    testdir.monkeypatch.setenv("STABLE", "1")
+    result = testdir.runpytest("-p", "cacheprovider")
+    result.assert_outcomes(passed=1)
+
+    with open(testdir.tmpdir / ".pytest_cache/v/asyncio-cooperative/flakes") as f:
+        history = json.load(f)
+    assert history == {"test_flake_history.py::test_a": {"runs": 2, "retried": 1}}
@@ -1,3 +1,6 @@
+import asyncio
+
+
 def test_lock(testdir):
     testdir.makeconftest("""""")
 
@@ -77,3 +80,99 @@ def test_lock_with_failure(testdir):
     result = testdir.runpytest()
 
     result.assert_outcomes(passed=1, failed=1)
+
+
+def test_rwlock(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+        from pytest_asyncio_cooperative import RWLock
+
+        rwlock = RWLock()
+        readers = 0
+        writers = 0
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative
+        async def test_read(x):
+            global readers
+            async with rwlock.read():
+                readers += 1
+                assert writers == 0
+                await asyncio.sleep(0.5)
+                readers -= 1
+
+
+        @pytest.mark.parametrize("x", range(2))
+        @pytest.mark.asyncio_cooperative
+        async def test_write(x):
+            global writers
+            async with rwlock.write():
+                writers += 1
+                assert writers == 1 and readers == 0
+                await asyncio.sleep(0.5)
+                writers -= 1
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=6)
+    # Readers share the lock, each writer has it to itself
+    assert result.duration < 2
+
+
+def test_rwlock_cancelled_waiter():
+    from pytest_asyncio_cooperative import RWLock
+
+    rwlock = RWLock()
+
+    async def main():
+        async with rwlock.read():
+            writer = asyncio.ensure_future(rwlock.write().__aenter__())
+            await asyncio.sleep(0)
+            reader = asyncio.ensure_future(rwlock.read().__aenter__())
+            await asyncio.sleep(0)
+            assert not reader.done()
+
+            # The reader no longer has to wait behind the writer
+            writer.cancel()
+            await asyncio.wait_for(reader, 1)
+
+    asyncio.run(main())
+
+
+def test_keyed_lock(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+        from pytest_asyncio_cooperative import KeyedLock
+
+        locks = KeyedLock()
+        holders = {}
+
+
+        @pytest.mark.parametrize("key", ["users", "users", "orders", "items"])
+        @pytest.mark.asyncio_cooperative
+        async def test_a(key):
+            async with locks(key):
+                assert key not in holders
+                holders[key] = True
+                await asyncio.sleep(0.5)
+                del holders[key]
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=4)
+    assert result.duration < 1.5
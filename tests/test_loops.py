@@ -0,0 +1,110 @@
+import pytest
+
+
+def test_loop_factory(testdir):
+    # Behave like a retry plugin which calls item.runtest again
+    testdir.makeconftest(
+        """
+        import asyncio
+
+        import pytest
+
+
+        class CustomLoop(asyncio.SelectorEventLoop):
+            pass
+
+
+        def new_loop():
+            return CustomLoop()
+
+
+        @pytest.hookimpl(hookwrapper=True)
+        def pytest_runtest_call(item):
+            yield
+            item.runtest()
+    """
+    )
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        loops = []
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            loops.append(type(asyncio.get_running_loop()).__name__)
+
+
+        def test_b():
+            # The first run and the rerun
+            assert loops == ["CustomLoop", "CustomLoop"]
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-factory=conftest:new_loop")
+
+    result.assert_outcomes(passed=2)
+
+
+def test_loop_factory_uvloop(testdir):
+    pytest.importorskip("uvloop")
+
+    testdir.makeconftest("""""")
+
+    testdir.makeini(
+        """
+        [pytest]
+        asyncio_loop_factory = uvloop.new_event_loop
+    """
+    )
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+        import uvloop
+
+
+        @pytest.mark.parametrize("x", range(10))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x):
+            assert isinstance(asyncio.get_running_loop(), uvloop.Loop)
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.cooperative_thread
+        def test_thread():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-monitor")
+
+    result.assert_outcomes(passed=11)
+    result.stdout.fnmatch_lines(["*top loop blockers*"])
+
+
+def test_loop_factory_unknown(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-factory=asyncio.not_a_loop_factory")
+
+    result.stderr.fnmatch_lines(
+        ["*Unable to import asyncio loop factory 'asyncio.not_a_loop_factory'*"]
+    )
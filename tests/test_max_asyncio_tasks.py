@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_max_asyncio_tasks(pytester):
     pytester.makepyfile(
         """
@@ -24,3 +27,99 @@ def test_max_asyncio_tasks(pytester):
     result = pytester.runpytest("--max-asyncio-tasks=2")
 
     result.assert_outcomes(passed=4)
+
+
+def test_max_asyncio_tasks_refills_all_free_slots(pytester):
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(6))
+        @pytest.mark.asyncio_cooperative
+        async def test_concurrent(x: int) -> None:
+            await asyncio.sleep(1)
+    """
+    )
+
+    result = pytester.runpytest("--max-asyncio-tasks=3")
+
+    result.assert_outcomes(passed=6)
+    assert result.duration < 3
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_asyncio_scheduler(pytester, scheduler):
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        concurrent = set()
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative
+        async def test_concurrent(x: int) -> None:
+            concurrent.add(x)
+            assert len(concurrent) <= 2
+
+            await asyncio.sleep(0.5)
+
+            concurrent.remove(x)
+    """
+    )
+
+    result = pytester.runpytest(
+        "--max-asyncio-tasks=2", f"--asyncio-scheduler={scheduler}"
+    )
+
+    result.assert_outcomes(passed=4)
+
+
+def test_unknown_asyncio_scheduler(pytester):
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            pass
+    """
+    )
+
+    result = pytester.runpytest("--asyncio-scheduler=nope")
+
+    assert "Unknown asyncio scheduler 'nope'" in result.stdout.str()
+
+
+def test_coroutines_created_on_admission(pytester):
+    pytester.makepyfile(
+        """
+        import gc
+        import inspect
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(20))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x: int) -> None:
+            wrappers = [
+                o
+                for o in gc.get_objects()
+                if inspect.iscoroutine(o)
+                and o.__name__ == "test_wrapper"
+                and inspect.getcoroutinestate(o) != inspect.CORO_CLOSED
+            ]
+            assert len(wrappers) == 1
+    """
+    )
+
+    result = pytester.runpytest("--max-asyncio-tasks=1")
+
+    result.assert_outcomes(passed=20)
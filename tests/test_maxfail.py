@@ -0,0 +1,186 @@
+import pytest
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+@pytest.mark.parametrize("reporter", ["inline", "thread"])
+def test_exitfirst_cancels_running_tests(testdir, scheduler, reporter):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture
+        async def resource():
+            yield
+            with open("teardown.txt", "w") as f:
+                f.write("torn down")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.1)
+            assert False
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_slow(resource):
+            await asyncio.sleep(10)
+
+
+        @pytest.mark.parametrize("x", range(10))
+        @pytest.mark.asyncio_cooperative
+        async def test_not_admitted(x):
+            await asyncio.sleep(10)
+
+
+        def test_sync():
+            pass
+    """
+    )
+
+    result = testdir.runpytest(
+        "-x",
+        "-rs",
+        "--max-asyncio-tasks=2",
+        f"--asyncio-scheduler={scheduler}",
+        f"--asyncio-reporter={reporter}",
+    )
+
+    # test_slow and the test admitted in place of test_fail
+    result.assert_outcomes(failed=1, skipped=2)
+    result.stdout.fnmatch_lines(
+        ["*Interrupted: stopping after 1 failures*", "*stopping after 1 failures*"]
+    )
+    assert result.duration < 2
+    with open(testdir.tmpdir / "teardown.txt") as f:
+        assert f.read() == "torn down"
+
+
+def test_maxfail(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", [0.1, 0.2, 1])
+        @pytest.mark.asyncio_cooperative
+        async def test_fail(x):
+            await asyncio.sleep(x)
+            assert False
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_slow():
+            await asyncio.sleep(10)
+    """
+    )
+
+    result = testdir.runpytest("--maxfail=2")
+
+    result.assert_outcomes(failed=2, skipped=2)
+    assert result.duration < 1
+
+
+def test_exitfirst_stops_other_workers(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(2))
+        @pytest.mark.asyncio_cooperative
+        async def test_slow(x):
+            await asyncio.sleep(10)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.5)
+            assert False
+    """
+    )
+
+    result = testdir.runpytest("-x", "--asyncio-workers=2")
+
+    result.assert_outcomes(failed=1, skipped=2)
+    assert result.duration < 3
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_exitfirst_during_flakey_backoff(testdir, scheduler):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.flakey(retries=2, backoff=2)
+        @pytest.mark.asyncio_cooperative
+        async def test_flakey():
+            assert False
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.1)
+            assert False
+    """
+    )
+
+    result = testdir.runpytest("-x", f"--asyncio-scheduler={scheduler}")
+
+    # The retry waiting out its backoff is interrupted instead of waited for
+    result.assert_outcomes(failed=1, skipped=1)
+    assert result.duration < 1.5
+
+
+@pytest.mark.parametrize("scheduler", ["queue", "legacy"])
+def test_exitfirst_during_flakey_backoff_after_fixture_error(testdir, scheduler):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture
+        async def broken():
+            raise RuntimeError("broken fixture")
+
+
+        @pytest.mark.flakey(retries=2, backoff=1)
+        @pytest.mark.asyncio_cooperative
+        async def test_flakey(broken):
+            pass
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.1)
+            assert False
+    """
+    )
+
+    result = testdir.runpytest("-x", f"--asyncio-scheduler={scheduler}")
+
+    # The earlier attempt's setup error isn't reported for the interrupted retry
+    result.assert_outcomes(failed=1, skipped=1)
+    result.stdout.no_fnmatch_line("*INTERNALERROR*")
+    result.stdout.no_fnmatch_line("*broken fixture*")
@@ -0,0 +1,165 @@
+import json
+
+
+def test_loop_monitor(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_blocking_io():
+            await asyncio.sleep(0.1)
+            time.sleep(0.5)
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative
+        async def test_cooperative(x):
+            await asyncio.sleep(0.5)
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-monitor")
+
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(
+        [
+            "*top loop blockers*",
+            "event loop lag: max 0.*s, mean *s over * heartbeats",
+            "0.5*s longest step, 0.5*s total, 1 slow steps *::test_blocking_io",
+        ]
+    )
+
+
+def test_loop_monitor_disabled(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_blocking_io():
+            time.sleep(0.2)
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=1)
+    result.stdout.no_fnmatch_line("*top loop blockers*")
+
+
+def test_loop_monitor_json(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.fixture
+        async def slow_fixture():
+            time.sleep(0.2)
+            yield
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fixture_blocks(slow_fixture):
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_gather():
+            async def child():
+                time.sleep(0.3)
+
+            await asyncio.gather(child(), child())
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-monitor-json=monitor.json")
+
+    result.assert_outcomes(passed=2)
+    with open(testdir.tmpdir / "monitor.json") as f:
+        data = json.load(f)
+
+    assert data["lag"]["max"] >= 0.5
+    blockers = {b["nodeid"].split("::")[-1]: b for b in data["blockers"]}
+
+    # Steps of child tasks count towards the test which created them
+    assert blockers["test_gather"]["slow"] == 2
+    assert blockers["test_gather"]["total"] >= 0.6
+
+    # So do fixture setups
+    assert blockers["test_fixture_blocks"]["slow"] == 1
+    assert blockers["test_fixture_blocks"]["longest"] >= 0.2
+    assert data["blockers"][0]["nodeid"].endswith("test_gather")
+
+
+def test_loop_monitor_idle_lag(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_idle():
+            await asyncio.sleep(1)
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-monitor-json=monitor.json")
+
+    result.assert_outcomes(passed=1)
+    with open(testdir.tmpdir / "monitor.json") as f:
+        data = json.load(f)
+
+    # Nothing blocks the loop so heartbeats run on time
+    assert data["lag"]["heartbeats"] >= 10
+    assert data["lag"]["mean"] < 0.02
+
+
+def test_loop_monitor_workers(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import time
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(2))
+        @pytest.mark.asyncio_cooperative
+        async def test_blocking_io(x):
+            time.sleep(0.2)
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-loop-monitor", "--asyncio-workers=2")
+
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*top loop blockers*",
+            "0.2*s longest step, 0.2*s total, 1 slow steps *test_blocking_io[[]*]",
+            "0.2*s longest step, 0.2*s total, 1 slow steps *test_blocking_io[[]*]",
+        ]
+    )
@@ -0,0 +1,113 @@
+import pytest
+
+
+TEST_MODULE = """
+    import asyncio
+
+    import pytest
+
+    order = []
+
+
+    @pytest.mark.parametrize("duration", [0.1, 0.3, 0.2])
+    @pytest.mark.asyncio_cooperative
+    async def test_a(duration):
+        order.append(duration)
+        await asyncio.sleep(duration)
+
+
+    def test_order():
+        print("ORDER", order)
+"""
+
+
+def test_longest_first(testdir):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    # The first run records durations in pytest's cache
+    result = testdir.runpytest("-s", "--asyncio-order=longest-first")
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(["*ORDER [[]0.1, 0.3, 0.2[]]"])
+
+    result = testdir.runpytest(
+        "-s", "--asyncio-order=longest-first", "--max-asyncio-tasks=1"
+    )
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(["*ORDER [[]0.3, 0.2, 0.1[]]"])
+
+
+@pytest.mark.parametrize("order", [None, "collection"])
+def test_collection_order(testdir, order):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    args = ["-s"] if order is None else ["-s", f"--asyncio-order={order}"]
+    testdir.runpytest(*args)
+    result = testdir.runpytest(*args)
+
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(["*ORDER [[]0.1, 0.3, 0.2[]]"])
+
+
+def test_unknown_order(testdir):
+    testdir.makeconftest("""""")
+    testdir.makepyfile(TEST_MODULE)
+
+    result = testdir.runpytest("--asyncio-order=shortest-first")
+
+    result.stdout.fnmatch_lines(["*Unknown asyncio order 'shortest-first'*"])
+
+
+def test_grouped(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        order = []
+        database_events = []
+
+
+        @pytest.fixture(scope="module")
+        async def database():
+            database_events.append("setup")
+            yield
+            database_events.append("teardown")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(database):
+            order.append("a")
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            order.append("b")
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_c(database):
+            order.append("c")
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_d():
+            order.append("d")
+            assert database_events == ["setup", "teardown"]
+
+
+        def test_order():
+            assert order == ["a", "c", "b", "d"]
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-order=grouped", "--max-asyncio-tasks=2")
+
+    result.assert_outcomes(passed=5)
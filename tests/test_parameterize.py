@@ -212,3 +212,42 @@ def test_parametrize_session_fixture_with_indirect(testdir):
     ]
 
     assert includes_lines_in_order(expected_lines, result.stdout.lines)
+
+
+def test_parameterize_shares_resolution_plan(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+        from pytest_asyncio_cooperative.fixtures import resolution_plans_key
+
+
+        @pytest.fixture
+        async def resource(request):
+            return request.param * 2
+
+
+        @pytest.mark.asyncio_cooperative
+        @pytest.mark.parametrize("resource", [1, 2, 3], indirect=True)
+        @pytest.mark.parametrize("number", range(10))
+        async def test_a(resource, number):
+            assert resource in [2, 4, 6]
+            await asyncio.sleep(0.1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            pass
+
+
+        def test_plans(request):
+            assert len(request.config.stash[resolution_plans_key]) == 2
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=32)
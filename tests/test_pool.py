@@ -0,0 +1,202 @@
+import pytest
+
+
+@pytest.mark.parametrize("fixture_def", ["def", "async def"])
+def test_pool_leases_are_exclusive(testdir, fixture_def):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        f"""
+        import asyncio
+        import itertools
+
+        import pytest
+
+        from pytest_asyncio_cooperative import cooperative_pool
+
+        ids = itertools.count()
+        made = []
+        in_use = set()
+
+
+        @cooperative_pool(size=2)
+        {fixture_def} connection():
+            connection = next(ids)
+            made.append(connection)
+            yield connection
+            made.remove(connection)
+
+
+        @pytest.mark.parametrize("x", range(6))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x, connection):
+            assert connection not in in_use
+            in_use.add(connection)
+            await asyncio.sleep(0.1)
+            in_use.remove(connection)
+            assert len(made) <= 2
+
+
+        def test_torn_down():
+            assert made == []
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=7)
+    # Two at a time
+    assert 0.3 <= result.duration < 0.6
+
+
+def test_pool_fixture_with_dependencies(testdir):
+    testdir.makeconftest(
+        """
+        import pytest
+
+        from pytest_asyncio_cooperative import cooperative_pool
+
+
+        @pytest.fixture(scope="session")
+        async def server():
+            return "server"
+
+
+        @cooperative_pool(size=3, scope="module")
+        async def connection(server):
+            with open("events.txt", "a") as f:
+                f.write("connect\\n")
+            yield f"connection to {server}"
+            with open("events.txt", "a") as f:
+                f.write("disconnect\\n")
+    """
+    )
+
+    testdir.makepyfile(
+        test_first="""
+        import asyncio
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative
+        async def test_first(x, connection):
+            await asyncio.sleep(0.1)
+            assert connection == "connection to server"
+    """,
+        test_second="""
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_second():
+            with open("events.txt") as f:
+                assert f.read().splitlines() == ["connect"] * 3 + ["disconnect"] * 3
+    """,
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=3")
+
+    result.assert_outcomes(passed=4)
+
+
+def test_pool_resources_reused(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import pytest
+
+        from pytest_asyncio_cooperative import cooperative_pool
+
+        made = []
+
+
+        @cooperative_pool(size=5)
+        async def connection():
+            made.append(object())
+            return made[-1]
+
+
+        @pytest.mark.parametrize("x", range(10))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x, connection):
+            assert connection in made
+
+
+        def test_made():
+            assert len(made) == 1
+    """
+    )
+
+    # One test at a time, so the connection is always idle when the next asks
+    result = testdir.runpytest("--max-asyncio-tasks=1")
+
+    result.assert_outcomes(passed=11)
+
+
+def test_pool_requires_cooperative_test(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        from pytest_asyncio_cooperative import cooperative_pool
+
+
+        @cooperative_pool(size=1)
+        def connection():
+            return 1
+
+
+        def test_a(connection):
+            pass
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*'connection' is pooled*"])
+
+
+def test_pool_lease_returned_when_sibling_fixture_fails(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        from pytest_asyncio_cooperative import cooperative_pool
+
+
+        @cooperative_pool(size=1)
+        async def connection():
+            yield "connection"
+
+
+        @pytest.fixture
+        async def broken():
+            await asyncio.sleep(0.1)
+            raise RuntimeError("broken fixture")
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(connection, broken):
+            pass
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b(connection):
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-task-timeout=5")
+
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(["*RuntimeError: broken fixture*"])
+    result.stdout.no_fnmatch_line("*is pooled*")
+    assert result.duration < 2
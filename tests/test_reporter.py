@@ -0,0 +1,101 @@
+import pytest
+
+
+@pytest.mark.parametrize("reporter", ["inline", "thread"])
+def test_reporter(testdir, reporter):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            await asyncio.sleep(0.5)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            await asyncio.sleep(0.5)
+            assert False
+
+
+        @pytest.mark.parametrize("x", range(10))
+        @pytest.mark.asyncio_cooperative
+        async def test_c(x):
+            await asyncio.sleep(0.01 * x)
+    """
+    )
+
+    result = testdir.runpytest(f"--asyncio-reporter={reporter}")
+
+    result.assert_outcomes(passed=11, failed=1)
+
+
+def test_thread_reporter_preserves_order(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(5))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x):
+            await asyncio.sleep(0.01)
+    """
+    )
+
+    result = testdir.runpytest(
+        "-v", "--max-asyncio-tasks=1", "--asyncio-reporter=thread"
+    )
+
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(
+        [f"*test_a?{x}? PASSED*" for x in range(5)], consecutive=True
+    )
+
+
+def test_thread_reporter_does_not_block_loop(testdir):
+    testdir.makeconftest(
+        """
+        import time
+
+
+        def pytest_runtest_logreport(report):
+            if report.when == "call":
+                time.sleep(0.3)
+    """
+    )
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            pass
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_b():
+            longest_gap = 0
+            for _ in range(20):
+                start = time.monotonic()
+                await asyncio.sleep(0.05)
+                longest_gap = max(longest_gap, time.monotonic() - start)
+            assert longest_gap < 0.25
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-reporter=thread")
+
+    result.assert_outcomes(passed=2)
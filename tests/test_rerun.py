@@ -0,0 +1,54 @@
+def test_rerun_executor(testdir):
+    # Behave like a retry plugin which calls item.runtest again
+    testdir.makeconftest(
+        """
+        import pytest
+
+
+        @pytest.hookimpl(hookwrapper=True)
+        def pytest_runtest_call(item):
+            yield
+            for _ in range(3):
+                item.runtest()
+    """
+    )
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import threading
+
+        import pytest
+
+        setups = []
+        teardowns = []
+        threads = set()
+
+
+        @pytest.fixture
+        async def resource():
+            setups.append(1)
+            yield len(setups)
+            teardowns.append(1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a(resource):
+            assert resource == len(setups)
+            threads.add(threading.get_ident())
+            await asyncio.sleep(0.1)
+
+
+        def test_b():
+            assert len(setups) == 4
+            assert len(teardowns) == 4
+
+            # The first run is on the main thread, all reruns share one thread
+            assert len(threads) == 2
+    """
+    )
+
+    result = testdir.runpytest("-v")
+
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["asyncio-cooperative: 3 tests were rerun"])
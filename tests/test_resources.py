@@ -0,0 +1,117 @@
+def test_resource_limits(testdir):
+    testdir.makeini(
+        """
+        [pytest]
+        asyncio_resource_limits = db:1 s3:2
+    """
+    )
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        in_use = {"db": 0, "s3": 0}
+        most_used = {"db": 0, "s3": 0}
+
+
+        async def use(*resources):
+            for name in resources:
+                in_use[name] += 1
+                most_used[name] = max(most_used[name], in_use[name])
+            await asyncio.sleep(0.3)
+            for name in resources:
+                in_use[name] -= 1
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative(resources={"db": 1, "s3": 1})
+        async def test_db(x):
+            await use("db", "s3")
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative(resources={"s3": 1})
+        async def test_s3(x):
+            await use("s3")
+
+
+        @pytest.mark.parametrize("x", range(2))
+        @pytest.mark.asyncio_cooperative
+        async def test_unlimited(x):
+            await use()
+
+
+        def test_most_used():
+            assert most_used == {"db": 1, "s3": 2}
+    """
+    )
+
+    result = testdir.runpytest("--max-asyncio-tasks=3")
+
+    result.assert_outcomes(passed=9)
+    # Tests waiting for the db don't hold up the others
+    assert result.duration < 1.5
+
+
+def test_resource_limits_option(testdir):
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        in_use = 0
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative(resources={"db": 2})
+        async def test_db(x):
+            global in_use
+            in_use += 2
+            assert in_use <= 4
+            await asyncio.sleep(0.1)
+            in_use -= 2
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-resource-limits=db:4,s3:1")
+
+    result.assert_outcomes(passed=4)
+
+
+def test_unknown_resource(testdir):
+    testdir.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative(resources={"db": 1})
+        async def test_db():
+            pass
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.stdout.fnmatch_lines(
+        ["*Unknown asyncio resource 'db' used by test_unknown_resource.py::test_db*"]
+    )
+
+
+def test_invalid_resource_limit(testdir):
+    testdir.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_a():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-resource-limits=db")
+
+    result.stderr.fnmatch_lines(["*Invalid asyncio resource limit 'db'*"])
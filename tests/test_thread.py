@@ -0,0 +1,178 @@
+import pytest
+
+
+def test_cooperative_thread(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import threading
+        import time
+
+        import pytest
+
+
+        @pytest.fixture
+        def resource():
+            yield "resource"
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.cooperative_thread
+        def test_blocking(x, resource):
+            assert resource == "resource"
+            assert threading.current_thread() is not threading.main_thread()
+            time.sleep(1)
+
+
+        @pytest.mark.cooperative_thread
+        def test_blocking_fail():
+            time.sleep(1)
+            assert False
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_async():
+            await asyncio.sleep(1)
+
+
+        def test_sync():
+            assert threading.current_thread() is threading.main_thread()
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=6, failed=1)
+    assert result.duration < 2.5
+
+
+def test_asyncio_thread_workers(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import time
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.cooperative_thread
+        def test_blocking(x):
+            time.sleep(0.5)
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-thread-workers=1")
+
+    result.assert_outcomes(passed=3)
+    assert result.duration >= 1.5
+
+
+def test_asyncio_sync_executor_thread(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(3))
+        @pytest.mark.asyncio_cooperative
+        def test_blocking(x):
+            time.sleep(1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_async():
+            await asyncio.sleep(1)
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-sync-executor=thread")
+
+    result.assert_outcomes(passed=4)
+    assert result.duration < 2.5
+    assert "blocking the event loop" not in result.stdout.str()
+
+
+def test_inline_sync_tests_blocking_the_loop(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative
+        def test_blocking():
+            time.sleep(0.3)
+
+
+        @pytest.mark.asyncio_cooperative
+        def test_quick():
+            pass
+    """
+    )
+
+    result = testdir.runpytest()
+
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= synchronous tests blocking the event loop =*",
+            "0.3?s test_inline_sync_tests_blocking_the_loop.py::test_blocking",
+        ]
+    )
+    assert "::test_quick" not in result.stdout.str()
+
+
+@pytest.mark.parametrize(
+    "marker,args",
+    [
+        ("cooperative_thread(timeout=0.3)", []),
+        ("asyncio_cooperative(timeout=0.3)", ["--asyncio-sync-executor=thread"]),
+    ],
+)
+def test_thread_timeout_waits_before_teardown(testdir, marker, args):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        f"""
+        import time
+
+        import pytest
+
+        log = []
+
+
+        @pytest.fixture
+        def resource():
+            resource = {{"open": True}}
+            yield resource
+            resource["open"] = False
+            log.append("teardown")
+
+
+        @pytest.mark.{marker}
+        def test_slow(resource):
+            time.sleep(1)
+            log.append(f"body open={{resource['open']}}")
+
+
+        def test_log():
+            assert log == ["body open=True", "teardown"]
+    """
+    )
+
+    result = testdir.runpytest(*args)
+
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*CancelledError*"])
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from pytest_asyncio_cooperative.workers import shard_items
+
+
+def test_workers(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import os
+        import time
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        def pid():
+            return os.getpid()
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative
+        async def test_cpu_bound(x, pid):
+            assert pid == os.getpid()
+            time.sleep(1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.1)
+            assert False
+
+
+        def test_sync():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("--asyncio-workers=2")
+
+    result.assert_outcomes(passed=5, failed=1)
+    assert result.duration < 3.5
+
+
+def test_shard_items_balances_expected_durations():
+    items = [SimpleNamespace(nodeid=str(i)) for i in range(6)]
+    durations = [10, 1, 1, 1, 1, 6]
+
+    shards = shard_items(items, durations, 2)
+
+    assert [[item.nodeid for item in shard] for shard in shards] == [
+        ["0"],
+        ["1", "2", "3", "4", "5"],
+    ]
@@ -0,0 +1,134 @@
+import re
+
+import pytest
+
+pytest.importorskip("xdist")
+
+
+@pytest.mark.parametrize("dist", ["load", "worksteal"])
+def test_xdist(testdir, dist):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(8))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x):
+            await asyncio.sleep(1)
+
+
+        @pytest.mark.asyncio_cooperative
+        async def test_fail():
+            await asyncio.sleep(0.1)
+            assert False
+
+
+        @pytest.mark.skip
+        @pytest.mark.asyncio_cooperative
+        async def test_skip():
+            pass
+
+
+        def test_sync():
+            pass
+    """
+    )
+
+    result = testdir.runpytest("-n", "2", f"--dist={dist}")
+
+    result.assert_outcomes(passed=9, failed=1, skipped=1)
+    assert result.duration < 4
+
+
+def test_xdist_max_asyncio_tasks_total(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        concurrent = set()
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative
+        async def test_concurrent(x):
+            concurrent.add(x)
+            assert len(concurrent) <= 1
+
+            await asyncio.sleep(0.5)
+
+            concurrent.remove(x)
+    """
+    )
+
+    result = testdir.runpytest("-n", "2", "--max-asyncio-tasks-total=2")
+
+    result.assert_outcomes(passed=4)
+    assert result.duration >= 1
+
+
+def test_xdist_timing_in_junitxml(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import pytest
+
+
+        @pytest.mark.parametrize("x", range(4))
+        @pytest.mark.asyncio_cooperative
+        async def test_a(x):
+            await asyncio.sleep(1)
+    """
+    )
+
+    result = testdir.runpytest("-n", "2", "--junitxml=junit.xml")
+
+    result.assert_outcomes(passed=4)
+
+    times = re.findall(
+        r'<testcase [^>]*time="([\d.]+)"', (testdir.tmpdir / "junit.xml").read()
+    )
+    assert len(times) == 4
+    assert all(float(time) > 0.7 for time in times)
+
+
+def test_xdist_sync_test_does_not_freeze_cooperative_tests(testdir):
+    testdir.makeconftest("""""")
+
+    testdir.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.asyncio_cooperative(timeout=2)
+        async def test_a():
+            await asyncio.sleep(0.5)
+
+
+        def test_sync():
+            time.sleep(3)
+
+
+        @pytest.mark.asyncio_cooperative(timeout=2)
+        async def test_b():
+            await asyncio.sleep(0.5)
+    """
+    )
+
+    result = testdir.runpytest("-n", "1")
+
+    # The synchronous test runs after the cooperative ones instead of freezing
+    # them past their timeouts
+    result.assert_outcomes(passed=3)